@@ -0,0 +1,80 @@
+"""Create users, roles and forms
+
+Revision ID: 2d6b8e0f4a17
+Revises: 038f392600ac
+Create Date: 2026-10-19 08:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6b8e0f4a17'
+down_revision: Union[str, None] = '038f392600ac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 038f392600ac was published empty, and existing databases got these tables
+    # from create_all (unstamped or stamped at 038f392600ac), so only create the
+    # ones that are missing
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'roles' not in existing:
+        op.create_table('roles',
+        sa.Column('role', sa.String(), nullable=False),
+        sa.Column('actions', sa.Enum('INSERT', 'UPDATE_APPROVE', 'SIGNOFF', name='actionenum'), nullable=False),
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('role')
+        )
+        op.create_index(op.f('ix_roles_id'), 'roles', ['id'], unique=False)
+    if 'users' not in existing:
+        op.create_table('users',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('phonenumber', sa.String(), nullable=False),
+        sa.Column('is_admin', sa.Boolean(), nullable=True),
+        sa.Column('address', sa.String(), nullable=True),
+        sa.Column('date_of_birth', sa.DateTime(), nullable=True),
+        sa.Column('password_hash', sa.String(), nullable=False),
+        sa.Column('role_id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['role_id'], ['roles.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('phonenumber')
+        )
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    if 'forms' not in existing:
+        op.create_table('forms',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('fields', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+        op.create_index(op.f('ix_forms_id'), 'forms', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_forms_id'), table_name='forms')
+    op.drop_table('forms')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_roles_id'), table_name='roles')
+    op.drop_table('roles')
+    sa.Enum(name='actionenum').drop(op.get_bind(), checkfirst=True)
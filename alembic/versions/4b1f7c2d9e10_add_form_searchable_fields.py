@@ -0,0 +1,27 @@
+"""Add searchable_fields to forms
+
+Revision ID: 4b1f7c2d9e10
+Revises: 2d6b8e0f4a17
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1f7c2d9e10'
+down_revision: Union[str, None] = '2d6b8e0f4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('forms', sa.Column('searchable_fields', postgresql.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('forms', 'searchable_fields')
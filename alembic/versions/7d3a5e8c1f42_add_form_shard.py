@@ -0,0 +1,26 @@
+"""Add shard placement to forms
+
+Revision ID: 7d3a5e8c1f42
+Revises: 4b1f7c2d9e10
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3a5e8c1f42'
+down_revision: Union[str, None] = '4b1f7c2d9e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('forms', sa.Column('shard', sa.String(), server_default='primary', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('forms', 'shard')
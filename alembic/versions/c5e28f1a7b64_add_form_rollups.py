@@ -0,0 +1,59 @@
+"""Add form rollups
+
+Revision ID: c5e28f1a7b64
+Revises: a91c04e7b5d3
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e28f1a7b64'
+down_revision: Union[str, None] = 'a91c04e7b5d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('forms', sa.Column('rollup_fields', postgresql.JSON(), nullable=True))
+    op.create_table('form_rollups',
+    sa.Column('form_id', sa.Integer(), nullable=False),
+    sa.Column('field', sa.String(), nullable=False),
+    sa.Column('resolution', sa.String(), nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.Column('sum', sa.Float(), nullable=False),
+    sa.Column('min', sa.Float(), nullable=False),
+    sa.Column('max', sa.Float(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['form_id'], ['forms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('form_id', 'field', 'resolution', 'bucket')
+    )
+    op.create_index(op.f('ix_form_rollups_id'), 'form_rollups', ['id'], unique=False)
+    op.create_table('form_rollup_watermarks',
+    sa.Column('form_id', sa.Integer(), nullable=False),
+    sa.Column('last_id', sa.BigInteger(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['form_id'], ['forms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('form_id')
+    )
+    op.create_index(op.f('ix_form_rollup_watermarks_id'), 'form_rollup_watermarks', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_form_rollup_watermarks_id'), table_name='form_rollup_watermarks')
+    op.drop_table('form_rollup_watermarks')
+    op.drop_index(op.f('ix_form_rollups_id'), table_name='form_rollups')
+    op.drop_table('form_rollups')
+    op.drop_column('forms', 'rollup_fields')
@@ -0,0 +1,46 @@
+"""Add form jobs and form provisioning status
+
+Revision ID: e2b7d9f4c318
+Revises: c5e28f1a7b64
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7d9f4c318'
+down_revision: Union[str, None] = 'c5e28f1a7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('forms', sa.Column('provisioning_status', sa.String(), server_default='applied', nullable=False))
+    op.create_table('form_jobs',
+    sa.Column('form_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(), nullable=False),
+    sa.Column('arguments', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['form_id'], ['forms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_form_jobs_id'), 'form_jobs', ['id'], unique=False)
+    op.create_index('ix_form_jobs_status_run_after', 'form_jobs', ['status', 'run_after'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_form_jobs_status_run_after', table_name='form_jobs')
+    op.drop_index(op.f('ix_form_jobs_id'), table_name='form_jobs')
+    op.drop_table('form_jobs')
+    op.drop_column('forms', 'provisioning_status')
@@ -0,0 +1,54 @@
+"""
+CPU cost of serializing a list endpoint response, before and after the fast path.
+
+"before" mirrors the old pipeline: ORM-style objects validated through the
+response_model, run through jsonable_encoder and encoded with the stdlib json.
+"after" is the fast path: column tuples zipped into dicts and encoded with orjson.
+
+Run with: python -m src.bench_serialization [rows] [repeats]
+"""
+from datetime import datetime
+from types import SimpleNamespace
+import json
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+from src.routes.user_routes import UserResponse
+
+KEYS = ["id", "name", "email", "phonenumber", "is_admin", "address", "date_of_birth", "role_id"]
+
+
+def make_rows(count):
+    return [
+        (i, f"user_{i}", f"user_{i}@example.com", f"{9000000000 + i}", False, "abcd", datetime(2000, 9, 1, 9, 43, 44), 1)
+        for i in range(count)
+    ]
+
+
+def before(rows):
+    objects = [SimpleNamespace(**dict(zip(KEYS, row))) for row in rows]
+    validated = [UserResponse(**vars(obj)) for obj in objects]
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def after(rows):
+    return ORJSONResponse([dict(zip(KEYS, row)) for row in rows]).body
+
+
+def cpu_time(func, rows, repeats):
+    started = time.process_time()
+    for _ in range(repeats):
+        func(rows)
+    return (time.process_time() - started) / repeats
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rows = make_rows(count)
+    before_cpu = cpu_time(before, rows, repeats)
+    after_cpu = cpu_time(after, rows, repeats)
+    print(f"{count} rows | before: {before_cpu * 1000:.1f} ms CPU | after: {after_cpu * 1000:.1f} ms CPU | speedup: {before_cpu / after_cpu:.1f}x")
@@ -1,12 +1,38 @@
 from sqlalchemy import create_engine
+import os
 from sqlalchemy.orm import sessionmaker
 from src.models import Base  # noqa: F401
 
 SQLALCHEMY_DATABASE_URL = "postgresql://postgres:password@db/postgres"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Connection pool capacity per worker (SQLAlchemy defaults), also used by admission control
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Users, roles and forms always live on the primary database. Form tables can be
+# placed on additional shards, configured as
+# SHARD_DATABASE_URLS="shard1=postgresql://...;shard2=postgresql://..."
+PRIMARY_SHARD = "primary"
+SHARD_DATABASE_URLS = {
+    PRIMARY_SHARD: SQLALCHEMY_DATABASE_URL,
+    **dict(item.split("=", 1) for item in os.getenv("SHARD_DATABASE_URLS", "").split(";") if item),
+}
+
+_shard_engines = {PRIMARY_SHARD: engine}
+
+def get_shard_engine(shard: str):
+    """
+    Return the engine for a shard, creating it on first use.
+    """
+    if shard not in SHARD_DATABASE_URLS:
+        raise ValueError(f"Unknown shard {shard}")
+    if shard not in _shard_engines:
+        _shard_engines[shard] = create_engine(SHARD_DATABASE_URLS[shard], pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW)
+    return _shard_engines[shard]
+
 def get_db():
     db = SessionLocal()
     try:
@@ -1,8 +1,21 @@
-from fastapi import FastAPI, Depends
-from fastapi.security import OAuth2PasswordBearer
-from src import database
-from src.routes import form_router, user_router, data_entry_router
-import logging
+import time
+
+PROCESS_STARTED_AT = time.monotonic()
+
+from fastapi import FastAPI, Depends, Request  # noqa: E402
+from fastapi.security import OAuth2PasswordBearer  # noqa: E402
+from src import database  # noqa: E402
+from src.routes import form_router, start_form_job_worker, user_router, data_entry_router, dashboard_router, rollup_router, aggregate_router, start_reconcile_thread, start_rollup_thread  # noqa: E402
+from src.utils import warm_caches, admission_control, admission_stats, idempotency_middleware, start_idempotency_purge_thread  # noqa: E402
+import logging  # noqa: E402
+import os  # noqa: E402
+
+# "create_all" creates missing tables on boot (development). "check_revision" only
+# verifies that the database is at the Alembic head and refuses to start otherwise;
+# migrations are then applied once with `alembic upgrade head` before rolling out workers.
+DB_STARTUP_MODE = os.getenv("DB_STARTUP_MODE", "create_all")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 app = FastAPI()
 
@@ -10,7 +23,61 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 @app.on_event("startup")
 def startup():
-    database.Base.metadata.create_all(bind=database.engine)
+    if DB_STARTUP_MODE == "check_revision":
+        check_database_revision()
+    else:
+        database.Base.metadata.create_all(bind=database.engine)
+
+    db = database.SessionLocal()
+    try:
+        warm_caches(db)
+    finally:
+        db.close()
+    start_form_job_worker()
+    start_reconcile_thread()
+    start_rollup_thread()
+    start_idempotency_purge_thread()
+    logger.info(f"STARTUP COMPLETED IN {time.monotonic() - PROCESS_STARTED_AT:.3f}s")
+
+
+def check_database_revision():
+    """
+    Fail fast if the database is not at the latest Alembic revision.
+    """
+    # Alembic is only needed in this mode, so keep it out of the import path
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(PROJECT_ROOT, "alembic"))
+    head = ScriptDirectory.from_config(config).get_current_head()
+
+    with database.engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+
+    if current != head:
+        raise RuntimeError(f"Database revision {current} does not match migration head {head}, run `alembic upgrade head`")
+    logger.info(f"DATABASE AT REVISION {current}")
+
+
+_first_request_served = False
+
+@app.middleware("http")
+async def log_time_to_first_request(request: Request, call_next):
+    global _first_request_served
+    response = await call_next(request)
+    if not _first_request_served:
+        _first_request_served = True
+        logger.info(f"TIME TO FIRST REQUEST: {time.monotonic() - PROCESS_STARTED_AT:.3f}s")
+    return response
+
+
+# Replay data-entry writes retried with the same Idempotency-Key
+app.middleware("http")(idempotency_middleware)
+
+# Bound concurrency per route class and shed load while the DB pool is saturated
+app.middleware("http")(admission_control)
 
 # Configure logging
 logging.basicConfig(
@@ -51,11 +118,18 @@ app.openapi = custom_openapi
 app.include_router(form_router, prefix="/api", tags=["Forms"])
 app.include_router(user_router, prefix="/api", tags=["Users"])
 app.include_router(data_entry_router, prefix="/api", tags=["Data Entry"])
+app.include_router(dashboard_router, prefix="/api", tags=["Dashboard"])
+app.include_router(rollup_router, prefix="/api", tags=["Rollups"])
+app.include_router(aggregate_router, prefix="/api", tags=["Data Entry"])
 
 @app.get("/", tags=["Root"])
 def read_root():
     return {"message": "OK"}
 
+@app.get("/admission", tags=["Root"])
+def read_admission_stats():
+    return admission_stats()
+
 # Example endpoint that requires authentication
 @app.get("/secure-endpoint", tags=["Secure"], dependencies=[Depends(oauth2_scheme)])
 def secure_endpoint():
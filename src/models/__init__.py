@@ -1,3 +1,6 @@
-from .forms import Form  # noqa: F401
-from .users import User, Role, ActionEnum  # noqa: F401
-from .models import Base  # noqa: F401
\ No newline at end of file
+from .forms import Form, FormJob  # noqa: F401
+from .dashboard import FormStatusCount  # noqa: F401
+from .rollups import FormRollup, FormRollupWatermark  # noqa: F401
+from .users import User, Role, ActionEnum, hash_passwords  # noqa: F401
+from .models import Base  # noqa: F401
+from .idempotency import IdempotencyKey  # noqa: F401
@@ -0,0 +1,19 @@
+from .models import Base
+from sqlalchemy import Column, ForeignKey, Integer, String, Date, UniqueConstraint
+
+
+class FormStatusCount(Base):
+    """
+    Number of records per form, approval status and creation day, maintained
+    incrementally by the data-entry paths and periodically reconciled.
+    """
+    __tablename__ = 'form_status_counts'
+    __table_args__ = (UniqueConstraint('form_id', 'status', 'day'),)
+
+    form_id = Column(Integer, ForeignKey('forms.id', ondelete='CASCADE'), nullable=False)
+    status = Column(String, nullable=False)
+    day = Column(Date, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<FormStatusCount {self.form_id} {self.status} {self.day}: {self.count}>'
@@ -1,5 +1,5 @@
 from .models import Base
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Integer, String, Text, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import JSON  # Use JSON for PostgreSQL
 from sqlalchemy.orm import relationship
 
@@ -10,8 +10,32 @@ class Form(Base):
     name = Column(String, unique=True, nullable=False)
     fields = Column(JSON, nullable=False)
     description = Column(String, nullable=True, default="description")
+    searchable_fields = Column(JSON, nullable=True)  # String/Text fields indexed for full-text search
+    rollup_fields = Column(JSON, nullable=True)  # Integer/Float fields aggregated over time buckets
+    shard = Column(String, nullable=False, default='primary', server_default='primary')  # database holding the form table
+    provisioning_status = Column(String, nullable=False, default='applied', server_default='applied')  # pending / moving / applied / failed
     created_by = Column(Integer, ForeignKey('users.id'), nullable=False)
     user = relationship('User')
     
     def __repr__(self):
-        return f'<Form {self.name}>'
\ No newline at end of file
+        return f'<Form {self.name}>'
+
+
+class FormJob(Base):
+    """
+    Background DDL operation on a form table (create, move), run by the form job
+    worker one at a time per form.
+    """
+    __tablename__ = 'form_jobs'
+    __table_args__ = (Index('ix_form_jobs_status_run_after', 'status', 'run_after'),)
+
+    form_id = Column(Integer, ForeignKey('forms.id', ondelete='CASCADE'), nullable=False)
+    operation = Column(String, nullable=False)
+    arguments = Column(JSON, nullable=True)
+    status = Column(String, nullable=False, default='pending')  # pending / moving / applied / failed
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f'<FormJob {self.id} {self.operation} {self.status}>'
\ No newline at end of file
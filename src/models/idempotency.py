@@ -0,0 +1,19 @@
+from .models import Base
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+
+
+class IdempotencyKey(Base):
+    """
+    Stored response of a data-entry write, replayed when a client retries the
+    request with the same Idempotency-Key header.
+    """
+    __tablename__ = 'idempotency_keys'
+
+    key = Column(String, unique=True, nullable=False)  # user (if authenticated), method, path and client key
+    fingerprint = Column(String(64), nullable=False)  # sha256 of the request body
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(LargeBinary, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<IdempotencyKey {self.key}>'
@@ -0,0 +1,36 @@
+from .models import Base
+from sqlalchemy import Column, ForeignKey, Integer, BigInteger, String, DateTime, Float, UniqueConstraint
+
+
+class FormRollup(Base):
+    """
+    Aggregates of one numeric form field over one time bucket
+    (minute, hour or day of the record's created_at).
+    """
+    __tablename__ = 'form_rollups'
+    __table_args__ = (UniqueConstraint('form_id', 'field', 'resolution', 'bucket'),)
+
+    form_id = Column(Integer, ForeignKey('forms.id', ondelete='CASCADE'), nullable=False)
+    field = Column(String, nullable=False)
+    resolution = Column(String, nullable=False)
+    bucket = Column(DateTime, nullable=False)
+    count = Column(BigInteger, nullable=False)
+    sum = Column(Float, nullable=False)
+    min = Column(Float, nullable=False)
+    max = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f'<FormRollup {self.form_id} {self.field} {self.resolution} {self.bucket}>'
+
+
+class FormRollupWatermark(Base):
+    """
+    Highest record id of a form already folded into its rollups.
+    """
+    __tablename__ = 'form_rollup_watermarks'
+
+    form_id = Column(Integer, ForeignKey('forms.id', ondelete='CASCADE'), unique=True, nullable=False)
+    last_id = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<FormRollupWatermark {self.form_id}: {self.last_id}>'
@@ -2,6 +2,8 @@ from .models import Base
 from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Integer, Enum as SqlEnum
 from sqlalchemy.orm import relationship
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+import os
 import bcrypt
 
 class ActionEnum(Enum):
@@ -9,6 +11,22 @@ class ActionEnum(Enum):
     UPDATE_APPROVE = "UPDATE_APPROVE"
     SIGNOFF = "SIGNOFF"
 
+def hash_password(password: str) -> str:
+    """
+    Hash a password with a fresh bcrypt salt.
+    """
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+
+def hash_passwords(passwords):
+    """
+    Hash many passwords in parallel. bcrypt releases the GIL while hashing,
+    so a thread per core keeps all cores busy without process start-up cost.
+    """
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        return list(executor.map(hash_password, passwords))
+
+
 class User(Base):
     __tablename__ = 'users'
     
@@ -28,7 +46,7 @@ class User(Base):
         """
         Hash the password and store it in the password_hash field.
         """
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
         """
@@ -1,3 +1,6 @@
-from .form_routes import router as form_router  # noqa: F401
+from .form_routes import router as form_router, start_form_job_worker  # noqa: F401
 from .user_routes import router as user_router  # noqa: F401
-from .data_entry_routes import router as data_entry_router  # noqa: F401
\ No newline at end of file
+from .data_entry_routes import router as data_entry_router  # noqa: F401
+from .dashboard_routes import router as dashboard_router, start_reconcile_thread  # noqa: F401
+from .rollup_routes import router as rollup_router, start_rollup_thread  # noqa: F401
+from .aggregate_routes import router as aggregate_router  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,220 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, cast, Float
+from src.database import get_db
+from src.routes.data_entry_routes import get_dynamic_table, get_form_bind
+from src.routes.form_routes import field_base_type, ApprovedStatusEnum, FIELD_TYPE_PATTERN, NUMERIC_TYPES, TEMPORAL_TYPES
+from src.utils import get_cached_form, rows_to_dicts, FastJSONResponse
+from pydantic import BaseModel
+from typing import List, Any
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+import logging
+import operator
+import threading
+import time
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Columns every form table has besides the form's own fields
+SYSTEM_FIELD_TYPES = {
+    'id': 'Integer',
+    'approved_status': f"Enum({','.join(status.value for status in ApprovedStatusEnum)})",
+    'last_approved_by': 'Integer',
+    'last_approved_by_role': 'Integer',
+    'last_approved_at': 'DateTime',
+    'created_at': 'DateTime',
+    'updated_at': 'DateTime',
+    'created_by': 'Integer',
+    'updated_by': 'Integer',
+}
+
+AGGREGATE_FUNCTIONS = ('count', 'sum', 'avg', 'min', 'max')
+
+FILTER_OPERATORS = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'gt': operator.gt,
+    'gte': operator.ge,
+}
+
+BUCKET_INTERVALS = ('minute', 'hour', 'day', 'week', 'month')
+
+INTEGER_TYPES = ('SmallInteger', 'Integer', 'BigInteger')
+
+# Field types without a meaningful ordering or scalar comparison
+COMPOSITE_TYPES = ('JSONB', 'Array')
+
+# Upper bound on the number of result rows
+MAX_AGGREGATE_ROWS = 10000
+
+# Identical specs within this window are answered from the per-worker cache
+AGGREGATE_CACHE_TTL_SECONDS = 30
+AGGREGATE_CACHE_SIZE = 256
+
+_cache_lock = threading.Lock()
+_cache = {}  # (table name, spec json) -> (stored_at, result)
+
+
+class AggregateFunction(BaseModel):
+    function: str
+    field: str = None
+
+class AggregateFilter(BaseModel):
+    field: str
+    op: str
+    value: Any
+
+class TimeBucket(BaseModel):
+    field: str = 'created_at'
+    interval: str
+
+class AggregateSpec(BaseModel):
+    group_by: List[str] = []
+    aggregates: List[AggregateFunction]
+    filters: List[AggregateFilter] = []
+    time_bucket: TimeBucket = None
+    limit: int = 1000
+
+
+@router.post("/data/{table_name}/aggregate")
+def aggregate_data(table_name: str, spec: AggregateSpec, db: Session = Depends(get_db)):
+    """
+    Run a declarative group-by / aggregate query inside the database.
+    """
+    key = (table_name, spec.json())
+    cached = _cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < AGGREGATE_CACHE_TTL_SECONDS:
+        return FastJSONResponse(cached[1])
+
+    logger.info(f"AGGREGATING FORM {table_name} | SPEC: {spec}")
+    result = run_aggregate(table_name, spec, db)
+
+    with _cache_lock:
+        if len(_cache) >= AGGREGATE_CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = (time.monotonic(), result)
+    return FastJSONResponse(result)
+
+
+def run_aggregate(table_name: str, spec: AggregateSpec, db: Session):
+    """
+    Validate the spec against the form's fields and compile it to one SQL statement.
+    """
+    form = get_cached_form(table_name, db)
+    if form is None:
+        raise HTTPException(status_code=404, detail="Form not found")
+    full_types = {**form.fields, **SYSTEM_FIELD_TYPES}
+    field_types = {name: field_base_type(field_type) for name, field_type in full_types.items()}
+
+    def column_for(field_name):
+        if field_name not in field_types:
+            raise HTTPException(status_code=400, detail=f"Unknown field {field_name}")
+        return table.c[field_name]
+
+    if not spec.aggregates:
+        raise HTTPException(status_code=400, detail="At least one aggregate is required")
+    if spec.limit < 1 or spec.limit > MAX_AGGREGATE_ROWS:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_AGGREGATE_ROWS}")
+
+    table = get_dynamic_table(table_name, db)
+
+    group_columns = []
+    if spec.time_bucket:
+        if spec.time_bucket.interval not in BUCKET_INTERVALS:
+            raise HTTPException(status_code=400, detail=f"interval must be one of {', '.join(BUCKET_INTERVALS)}")
+        if field_types.get(spec.time_bucket.field) not in TEMPORAL_TYPES:
+            raise HTTPException(status_code=400, detail=f"Field {spec.time_bucket.field} is not a DateTime or Date field")
+        group_columns.append(func.date_trunc(spec.time_bucket.interval, column_for(spec.time_bucket.field)).label('bucket'))
+    group_columns.extend(column_for(field_name) for field_name in spec.group_by)
+
+    aggregate_columns = []
+    for aggregate in spec.aggregates:
+        if aggregate.function not in AGGREGATE_FUNCTIONS:
+            raise HTTPException(status_code=400, detail=f"function must be one of {', '.join(AGGREGATE_FUNCTIONS)}")
+        if aggregate.field is None:
+            if aggregate.function != 'count':
+                raise HTTPException(status_code=400, detail=f"{aggregate.function} requires a field")
+            aggregate_columns.append(func.count().label('count'))
+            continue
+        if aggregate.function in ('sum', 'avg') and field_types.get(aggregate.field) not in NUMERIC_TYPES:
+            raise HTTPException(status_code=400, detail=f"Field {aggregate.field} is not numeric")
+        if aggregate.function in ('min', 'max') and field_types.get(aggregate.field) in COMPOSITE_TYPES:
+            raise HTTPException(status_code=400, detail=f"{aggregate.function} is not supported on {field_types[aggregate.field]} field {aggregate.field}")
+        expression = getattr(func, aggregate.function)(column_for(aggregate.field))
+        if aggregate.function in ('sum', 'avg') and field_types[aggregate.field] != 'Numeric':
+            # avg of integers and sum of BigIntegers come back as numeric; keep them JSON numbers
+            expression = cast(expression, Float)
+        aggregate_columns.append(expression.label(f'{aggregate.function}_{aggregate.field}'))
+
+    conditions = []
+    for condition in spec.filters:
+        column = column_for(condition.field)
+        if condition.op == 'in':
+            if not isinstance(condition.value, list):
+                raise HTTPException(status_code=400, detail="in filters take a list of values")
+            conditions.append(column.in_([coerce_filter_value(condition.field, full_types[condition.field], v) for v in condition.value]))
+        elif condition.op in FILTER_OPERATORS:
+            if condition.value is None and condition.op in ('eq', 'ne'):
+                # IS NULL / IS NOT NULL
+                conditions.append(FILTER_OPERATORS[condition.op](column, None))
+                continue
+            value = coerce_filter_value(condition.field, full_types[condition.field], condition.value)
+            conditions.append(FILTER_OPERATORS[condition.op](column, value))
+        else:
+            raise HTTPException(status_code=400, detail=f"op must be one of {', '.join([*FILTER_OPERATORS, 'in'])}")
+
+    stmt = select(*group_columns, *aggregate_columns).where(*conditions)
+    if group_columns:
+        stmt = stmt.group_by(*group_columns).order_by(*group_columns)
+    # One row past the limit tells whether the result was truncated
+    stmt = stmt.limit(spec.limit + 1)
+
+    rows = rows_to_dicts(db.execute(stmt, bind_arguments={"bind": get_form_bind(table_name, db)}))
+    return {"rows": rows[:spec.limit], "truncated": len(rows) > spec.limit}
+
+
+def coerce_filter_value(field_name, field_type, value):
+    """
+    Convert a filter value from JSON to the Python type of the field, so that
+    mismatched values are rejected with 400 instead of failing in the database.
+    """
+    match = FIELD_TYPE_PATTERN.match(field_type) if isinstance(field_type, str) else None
+    base, arguments = match.groups() if match else (None, None)
+    if base in COMPOSITE_TYPES:
+        raise HTTPException(status_code=400, detail=f"{base} field {field_name} cannot be filtered")
+    try:
+        if base in TEMPORAL_TYPES:
+            if not isinstance(value, str):
+                raise ValueError
+            return datetime.fromisoformat(value) if base == 'DateTime' else date.fromisoformat(value)
+        if base in INTEGER_TYPES:
+            if isinstance(value, bool) or not isinstance(value, (int, str)):
+                raise ValueError
+            return int(value)
+        if base in ('Float', 'Numeric'):
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                raise ValueError
+            number = Decimal(str(value))
+            if not number.is_finite():
+                raise ValueError
+            return float(number) if base == 'Float' else number
+        if base == 'Boolean':
+            if not isinstance(value, bool):
+                raise ValueError
+            return value
+        if base == 'Enum':
+            members = [member.strip() for member in arguments.split(',')]
+            if value not in members:
+                raise HTTPException(status_code=400, detail=f"{field_name} must be one of {', '.join(members)}")
+            return value
+        if not isinstance(value, str):
+            raise ValueError
+        return value
+    except (ValueError, InvalidOperation):
+        raise HTTPException(status_code=400, detail=f"Invalid {base} value for {field_name}: {value!r}")
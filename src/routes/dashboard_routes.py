@@ -0,0 +1,141 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy import MetaData, Table, select, func, cast, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.models import Form, FormStatusCount, User
+from src.database import get_db, get_shard_engine, engine, PRIMARY_SHARD
+from src.utils import fast_json_response, get_current_active_admin, start_periodic_job
+from datetime import date, timedelta
+import logging
+import os
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# How often the counters are rebuilt from the form tables, in seconds
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("DASHBOARD_RECONCILE_SECONDS", "3600"))
+
+# Advisory lock key so that only one worker reconciles at a time
+RECONCILE_LOCK_KEY = 720032
+
+
+@router.get("/dashboard/approval-status")
+def get_approval_status_counts(days: int = 7, form_id: int = None, db: Session = Depends(get_db)):
+    """
+    Pending / in-progress / approved counts per form and day for the last `days` days.
+    """
+    stmt = (
+        select(FormStatusCount.form_id, Form.name.label('form_name'), FormStatusCount.day, FormStatusCount.status, FormStatusCount.count).
+        join(Form, Form.id == FormStatusCount.form_id).
+        where(FormStatusCount.day > date.today() - timedelta(days=days), FormStatusCount.count != 0).
+        order_by(FormStatusCount.form_id, FormStatusCount.day, FormStatusCount.status)
+    )
+    if form_id is not None:
+        stmt = stmt.where(FormStatusCount.form_id == form_id)
+    return fast_json_response(db.execute(stmt))
+
+
+@router.post("/dashboard/reconcile")
+def reconcile_dashboard(db: Session = Depends(get_db), current_user: User = Depends(get_current_active_admin)):
+    reconciled = reconcile_status_counts(db)
+    return {"message": f"{reconciled} forms reconciled"}
+
+
+def record_status_change(db: Session, form_id: int, day: date, old_status, new_status):
+    """
+    Move one record between status counters. Runs in the caller's transaction,
+    so the counters are committed together with the record change.
+    """
+    changes = []
+    if old_status is not None:
+        changes.append((old_status, -1))
+    if new_status is not None:
+        changes.append((new_status, 1))
+
+    for status, delta in changes:
+        stmt = pg_insert(FormStatusCount.__table__).values(form_id=form_id, status=status, day=day, count=delta)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['form_id', 'status', 'day'],
+            set_={'count': FormStatusCount.__table__.c.count + delta, 'updated_at': func.now()},
+        ))
+
+
+def reconcile_status_counts(db: Session):
+    """
+    Rebuild the counters of every form from its table, correcting any drift
+    (records changed outside the API, failed cross-shard commits).
+
+    Counters are corrected by the difference to the actual counts rather than
+    replaced, so increments committed meanwhile are kept, and no lock is taken
+    on the form tables.
+    """
+    forms = db.query(Form.id, Form.name, Form.shard).filter(Form.provisioning_status == 'applied').all()
+    reconciled = 0
+    for form_id, name, shard in forms:
+        try:
+            reconcile_form_status_counts(db, form_id, name, shard)
+            reconciled += 1
+        except Exception as e:
+            db.rollback()
+            logger.error(f"DASHBOARD COUNTERS OF FORM {name} NOT RECONCILED: {e}")
+    logger.info(f"DASHBOARD COUNTERS RECONCILED FOR {reconciled} OF {len(forms)} FORMS")
+    return reconciled
+
+
+def read_status_counts(connection, form_id: int):
+    rows = connection.execute(
+        select(FormStatusCount.status, FormStatusCount.day, FormStatusCount.count).where(FormStatusCount.form_id == form_id)
+    )
+    return {(status, day): count for status, day, count in rows}
+
+
+def reconcile_form_status_counts(db: Session, form_id: int, name: str, shard: str):
+    bind = get_shard_engine(shard)
+    table = Table(name, MetaData(), autoload_with=bind)
+    day = cast(table.c.created_at, Date)
+    count_stmt = select(table.c.approved_status, day, func.count()).group_by(table.c.approved_status, day)
+
+    if shard == PRIMARY_SHARD:
+        # Writers commit a record and its counter together, so reading both from
+        # one snapshot gives the exact drift as of that snapshot
+        with bind.connect().execution_options(isolation_level="REPEATABLE READ") as connection:
+            stored = read_status_counts(connection, form_id)
+            rows = connection.execute(count_stmt).fetchall()
+        unsettled = set()
+    else:
+        # Records and counters commit separately, so counters that changed while
+        # the table was counted may be off by writes in flight; leave them to the next run
+        with engine.connect() as connection:
+            stored = read_status_counts(connection, form_id)
+        with bind.connect() as connection:
+            rows = connection.execute(count_stmt).fetchall()
+        with engine.connect() as connection:
+            after = read_status_counts(connection, form_id)
+        unsettled = {key for key in stored.keys() | after.keys() if stored.get(key) != after.get(key)}
+
+    deltas = {key: -count for key, count in stored.items()}
+    for status, row_day, count in rows:
+        if status is not None:
+            key = (getattr(status, "value", status), row_day)
+            deltas[key] = deltas.get(key, 0) + count
+
+    values = [
+        {"form_id": form_id, "status": status, "day": row_day, "count": delta}
+        for (status, row_day), delta in deltas.items() if delta and (status, row_day) not in unsettled
+    ]
+    if values:
+        stmt = pg_insert(FormStatusCount.__table__)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['form_id', 'status', 'day'],
+            set_={'count': FormStatusCount.__table__.c.count + stmt.excluded.count, 'updated_at': func.now()},
+        ), values)
+    db.commit()
+
+
+def start_reconcile_thread():
+    """
+    Periodically reconcile the counters in the background.
+    """
+    return start_periodic_job("dashboard-reconcile", RECONCILE_INTERVAL_SECONDS, RECONCILE_LOCK_KEY, reconcile_status_counts)
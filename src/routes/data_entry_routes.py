@@ -1,13 +1,16 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException  # noqa: F401
 from sqlalchemy.orm import Session
-from src.models import Form, User  # noqa: F401
-from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, Boolean, Float, Text, insert, select, update  # noqa: F401
-from src.database import get_db
+from src.models import Form, User, Role  # noqa: F401
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, Boolean, Float, Text, REAL, insert, select, update, func, tuple_, any_, bindparam, cast, literal  # noqa: F401
+from sqlalchemy.dialects.postgresql import ARRAY
+from src.database import get_db, get_shard_engine
+from src.routes.form_routes import SEARCH_CONFIG
+from src.routes.dashboard_routes import record_status_change
 from pydantic import BaseModel  # noqa: F401
 from typing import List  # noqa: F401
 import logging
-from src.utils import get_current_active_admin, get_current_active_user
+from src.utils import get_current_active_admin, get_current_active_user, get_cached_form, get_cached_table, invalidate_form, fast_json_response, FastJSONResponse
 
 # Create a logger
 logger = logging.getLogger(__name__)
@@ -20,6 +23,16 @@ class DataEntryCreate(BaseModel):
 class DataEntryApprove(BaseModel):
     user_id: int
 
+class DataEntryBatchFetch(BaseModel):
+    ids: List[int]
+    fields: List[str] = None
+
+# Upper bound on the page size of search results
+MAX_SEARCH_LIMIT = 100
+
+# Upper bound on the number of ids in one batch fetch
+MAX_BATCH_IDS = 10000
+
 
 @router.post("/data/{table_name}/insert")
 def insert_form_record(table_name: str, insert_data: DataEntryCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
@@ -32,6 +45,9 @@ def insert_form_record(table_name: str, insert_data: DataEntryCreate, db: Sessio
         "approved_status": "PENDING"
         })
     logger.info(f"UPDATED PAYLOAD: {insert_data}")
+    form = get_cached_form(table_name, db)
+    if form is not None:
+        record_status_change(db, form.id, insert_data['created_at'].date(), None, "PENDING")
     return insert_into_dynamic_table(table_name, insert_data, db)
 
 
@@ -39,25 +55,52 @@ def insert_form_record(table_name: str, insert_data: DataEntryCreate, db: Sessio
 def update_form_record(table_name: str, record_id: int, update_data: DataEntryCreate, db: Session = Depends(get_db)):
     return update_dynamic_table(table_name, record_id, update_data.data, db)
 
-# Retrieve data from a dynamic table
+# Retrieve data from a dynamic table, optionally only the given ids (ids=1,2,3)
+# and only the given columns (fields=name,age)
 @router.get("/data/{table_name}")
-def get_all_data(table_name: str, db: Session = Depends(get_db)):
-    data = get_data_from_dynamic_table(table_name, db)
-    logger.info(f"DATA: {data}")
-    return data
+def get_all_data(table_name: str, ids: str = None, fields: str = None, db: Session = Depends(get_db)):
+    field_names = parse_list_param(fields, "fields") if fields else None
+    if ids is None:
+        table = get_dynamic_table(table_name, db)
+        logger.info(f"GETTING ALL DATA FROM FORM {table_name}")
+        stmt = select(*get_projected_columns(table, field_names))
+        return fast_json_response(db.execute(stmt, bind_arguments={"bind": get_form_bind(table_name, db)}))
+
+    try:
+        record_ids = [int(record_id) for record_id in parse_list_param(ids, "ids")]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma separated list of integers")
+    return get_records_by_ids(table_name, record_ids, field_names, db)
+
+
+# Batch fetch for id sets too large for a query string
+@router.post("/data/{table_name}/batch")
+def get_data_batch(table_name: str, batch: DataEntryBatchFetch, db: Session = Depends(get_db)):
+    return get_records_by_ids(table_name, batch.ids, batch.fields, db)
+
+
+# Full-text search over the searchable fields of a form. Declared before the
+# /{record_id} route so that "search" is not parsed as a record id.
+@router.get("/data/{table_name}/search")
+def search_data(table_name: str, q: str, limit: int = 20, after_rank: float = None, after_id: int = None, db: Session = Depends(get_db)):
+    logger.info(f"SEARCHING FORM {table_name} | QUERY: {q} | AFTER: ({after_rank}, {after_id})")
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    return FastJSONResponse(search_dynamic_table(table_name, q, min(limit, MAX_SEARCH_LIMIT), after_rank, after_id, db))
 
 
 @router.get("/data/{table_name}/{record_id}")
 def get_data(table_name: str, record_id:int, db: Session = Depends(get_db)):
     logger.info(f"GETTING DATA FROM FORM {table_name} | DATA ID: {record_id}")
-    return get_record_from_dynamic_table(table_name, record_id, db)
+    return FastJSONResponse(get_record_from_dynamic_table(table_name, record_id, db))
 
 
 @router.post("/data/{table_name}/{record_id}/approve")
 def approve_data(approval_payload: DataEntryApprove, table_name: str, record_id:int, db: Session = Depends(get_db)):
     logger.info(f"APPROVING DATA FROM TABLE {table_name} | RECORD ID: {record_id} | APPROVED BY: {approval_payload}")
     approved_by = approval_payload.user_id
-    user = db.query(User).filter(User.id == approved_by).first()
+    # Authorization is read fresh on every approval, never from a cache
+    user = db.query(User.id, Role.actions).join(Role, User.role_id == Role.id).filter(User.id == approved_by).first()
 
     record = get_record_from_dynamic_table(table_name, record_id, db)
     if not record:
@@ -68,13 +111,13 @@ def approve_data(approval_payload: DataEntryApprove, table_name: str, record_id:
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    role = user.role
+    actions = user.actions
 
-    if role.actions.value not in ("UPDATE_APPROVE", "SIGNOFF"):
+    if actions.value not in ("UPDATE_APPROVE", "SIGNOFF"):
         raise HTTPException(status_code=401, detail="User not authorized to approve data")
     
     update_payload = {
-        "approved_status": "APPROVED" if role.actions.value == "SIGNOFF" else "IN_PROGRESS",
+        "approved_status": "APPROVED" if actions.value == "SIGNOFF" else "IN_PROGRESS",
         "last_approved_by": approval_payload.user_id,
         "last_approved_at": datetime.now(),
         "updated_at": datetime.now(),
@@ -82,6 +125,9 @@ def approve_data(approval_payload: DataEntryApprove, table_name: str, record_id:
     }
     logger.info(f"UPDATE PAYLOAD: {update_payload}")
 
+    form = get_cached_form(table_name, db)
+    if form is not None and record["approved_status"] != update_payload["approved_status"]:
+        record_status_change(db, form.id, record["created_at"].date(), record["approved_status"], update_payload["approved_status"])
     return update_dynamic_table(table_name, record_id, update_payload, db)
 
 
@@ -93,21 +139,98 @@ def delete_data(table_name: str, record_id:int, db: Session = Depends(get_db), c
 
 
 def get_dynamic_table(table_name, db):
-    metadata = MetaData()
-    table = Table(table_name, metadata, autoload_with=db.get_bind())
+    bind = get_form_bind(table_name, db)
+    form = get_cached_form(table_name, db)
+    return get_cached_table(table_name, db, bind=bind, version=form.updated_at if form else None)
+
+
+def get_writable_table(table_name, field_names, db):
+    """
+    The form table, checked to have every one of field_names. Fields added by
+    another worker may not have reached this worker's cache yet, so the form is
+    reloaded once before unknown fields are rejected.
+    """
+    table = get_dynamic_table(table_name, db)
+    known = {column.name for column in get_data_columns(table)}
+    if not known.issuperset(field_names):
+        invalidate_form(table_name)
+        table = get_dynamic_table(table_name, db)
+        unknown = set(field_names) - {column.name for column in get_data_columns(table)}
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
     return table
 
 
+def get_form_bind(table_name, db):
+    """
+    Engine of the shard holding a form table. Statements against form tables are
+    executed with this bind, everything else stays on the session's primary bind.
+    """
+    form = get_cached_form(table_name, db)
+    if form is None:
+        return db.get_bind()
+    if form.provisioning_status == 'pending':
+        raise HTTPException(status_code=409, detail=f"Form {table_name} is still being provisioned, retry shortly")
+    if form.provisioning_status == 'failed':
+        raise HTTPException(status_code=409, detail=f"Provisioning of form {table_name} failed, see /api/forms/{form.id}/jobs")
+    return get_shard_engine(form.shard)
+
+
+def get_data_columns(table):
+    """
+    Columns returned to clients, leaving out the generated search_vector.
+    """
+    return [column for column in table.c if column.name != 'search_vector']
+
+
+def parse_list_param(value: str, name: str):
+    items = [item.strip() for item in value.split(',') if item.strip()]
+    if not items:
+        raise HTTPException(status_code=400, detail=f"{name} must not be empty")
+    return items
+
+
+def get_projected_columns(table, field_names):
+    """
+    Data columns restricted to field_names (plus id), or all of them.
+    """
+    columns = get_data_columns(table)
+    if not field_names:
+        return columns
+    available = {column.name: column for column in columns}
+    unknown = [name for name in field_names if name not in available]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [available['id'], *[available[name] for name in dict.fromkeys(field_names) if name != 'id']]
+
+
+def get_records_by_ids(table_name: str, record_ids, field_names, db: Session):
+    """
+    Fetch many records in one query. The ids are sent as a single array
+    parameter (id = ANY(:ids)), so the statement is the same for any batch size.
+    Missing ids are simply absent from the result.
+    """
+    if len(record_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids can be fetched at once")
+    table = get_dynamic_table(table_name, db)
+    logger.info(f"GETTING {len(record_ids)} RECORDS FROM FORM {table_name}")
+
+    stmt = (
+        select(*get_projected_columns(table, field_names)).
+        where(table.c.id == any_(bindparam('ids', record_ids, type_=ARRAY(Integer)))).
+        order_by(table.c.id)
+    )
+    return fast_json_response(db.execute(stmt, bind_arguments={"bind": get_form_bind(table_name, db)}))
+
+
 def get_record_from_dynamic_table(table_name: str, record_id:int, db: Session):
     """
     Retrieve data from a dynamic table.
     """
-    metadata = MetaData()
-    metadata.reflect(bind=db.get_bind())
-    table = Table(table_name, metadata, autoload_with=db.get_bind())
+    table = get_dynamic_table(table_name, db)
     
-    stmt = select(table).where(table.c.id == record_id)
-    result = db.execute(stmt)
+    stmt = select(*get_data_columns(table)).where(table.c.id == record_id)
+    result = db.execute(stmt, bind_arguments={"bind": get_form_bind(table_name, db)})
     data = result.fetchone()
     
     if data is None:
@@ -116,35 +239,15 @@ def get_record_from_dynamic_table(table_name: str, record_id:int, db: Session):
     return data._asdict()
 
 
-def get_data_from_dynamic_table(table_name: str, db: Session):
-    """
-    Retrieve data from a dynamic table.
-    """
-    metadata = MetaData()
-    metadata.reflect(bind=db.get_bind())
-    table = Table(table_name, metadata, autoload_with=db.get_bind())
-    
-    stmt = select(table)
-    result = db.execute(stmt)
-    data = result.fetchall()
-    
-    # Convert the result to a list of dictionaries
-    data_dicts = [row._asdict() for row in data]
-    
-    return data_dicts
-
-
 def insert_into_dynamic_table(table_name, insert_data, db: Session):
     """
     Insert data into a dynamic table.
     """
-    metadata = MetaData()
-    metadata.reflect(bind=db.get_bind())
-    table = Table(table_name, metadata, autoload_with=db.get_bind())
+    table = get_writable_table(table_name, insert_data, db)
     
     stmt = insert(table).values(**insert_data)
 
-    result = db.execute(stmt)
+    result = db.execute(stmt, bind_arguments={"bind": get_form_bind(table_name, db)})
     db.commit()
 
     if result.rowcount == 0:
@@ -157,9 +260,9 @@ def update_dynamic_table(table_name, primary_key, update_data, db: Session):
     """
     Update data in a dynamic table.
     """
-    metadata = MetaData()
-    metadata.reflect(bind=db.get_bind())
-    table = Table(table_name, metadata, autoload_with=db.get_bind())
+    # Keep updated_at current on every write
+    update_data.setdefault('updated_at', datetime.now())
+    table = get_writable_table(table_name, update_data, db)
     
     stmt = (
         update(table).
@@ -167,10 +270,49 @@ def update_dynamic_table(table_name, primary_key, update_data, db: Session):
         values(**update_data)
     )
     
-    result = db.execute(stmt)
+    result = db.execute(stmt, bind_arguments={"bind": get_form_bind(table_name, db)})
     db.commit()
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Record not found")
     
-    return {"message": "Record updated successfully"}
\ No newline at end of file
+    return {"message": "Record updated successfully"}
+
+
+def search_dynamic_table(table_name, query_text, limit, after_rank, after_id, db: Session):
+    """
+    Ranked full-text search over a dynamic table with highlighting and keyset pagination.
+
+    Results are ordered by (rank, id) descending; pass the last row's rank and id
+    as after_rank / after_id to fetch the next page.
+    """
+    form = get_cached_form(table_name, db)
+    if form is None:
+        raise HTTPException(status_code=404, detail="Form not found")
+    if not form.searchable_fields:
+        raise HTTPException(status_code=400, detail="Form has no searchable fields")
+
+    table = get_dynamic_table(table_name, db)
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query_text)
+    rank = func.ts_rank(table.c.search_vector, ts_query)
+
+    # Rank and paginate on the GIN-indexed vector only, then build headlines for the page
+    page_stmt = select(table.c.id, rank.label('rank')).where(table.c.search_vector.op('@@')(ts_query))
+    if after_rank is not None and after_id is not None:
+        # ts_rank is a real; compare at that precision so tied ranks match the cursor exactly
+        page_stmt = page_stmt.where(tuple_(rank, table.c.id) < tuple_(cast(literal(after_rank), REAL), after_id))
+    page = page_stmt.order_by(rank.desc(), table.c.id.desc()).limit(limit).subquery()
+
+    document = func.concat_ws(' ', *[table.c[field_name] for field_name in form.searchable_fields])
+    stmt = (
+        select(*get_data_columns(table), page.c.rank, func.ts_headline(SEARCH_CONFIG, document, ts_query).label('headline')).
+        join(page, table.c.id == page.c.id).
+        order_by(page.c.rank.desc(), table.c.id.desc())
+    )
+    results = [row._asdict() for row in db.execute(stmt, bind_arguments={"bind": get_form_bind(table_name, db)}).fetchall()]
+
+    next_cursor = None
+    if len(results) == limit:
+        next_cursor = {"after_rank": results[-1]["rank"], "after_id": results[-1]["id"]}
+
+    return {"results": results, "next_cursor": next_cursor}
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from src.models import Form
-from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey, Enum as SqlEnum
-from src.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session, aliased
+from src.models import Form, FormJob, User
+from sqlalchemy import select, func, text, MetaData, Table, Column, Integer, SmallInteger, BigInteger, String, DateTime, Date, Boolean, Float, Numeric, Text, ForeignKey, Index, Computed, Enum as SqlEnum
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, insert as pg_insert
+from src.database import get_db, get_shard_engine, engine, SessionLocal, PRIMARY_SHARD
+from src.utils import invalidate_form, fast_json_response, get_current_active_admin, CACHE_TTL_SECONDS
 from pydantic import BaseModel
 from typing import List
 import logging
-from datetime import datetime
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 
 class ApprovedStatusEnum(Enum):
@@ -25,17 +31,41 @@ class FormCreate(BaseModel):
     fields: dict
     created_by: int
     desciption: str = ""
+    searchable_fields: List[str] = []
+    rollup_fields: List[str] = []
+    shard: str = PRIMARY_SHARD
 
 class FormUpdate(BaseModel):
     table_name: str
     fields: dict
 
+class FormMove(BaseModel):
+    shard: str
+
 class FormResponse(BaseModel):
     id: int
     name: str
     fields: dict
     created_by: int
     description: str = ""
+    searchable_fields: List[str] = None
+    rollup_fields: List[str] = None
+    shard: str = PRIMARY_SHARD
+    provisioning_status: str = "applied"
+
+    class Config:
+        orm_mode = True
+
+class FormJobResponse(BaseModel):
+    id: int
+    form_id: int
+    operation: str
+    arguments: dict = None
+    status: str
+    attempts: int
+    error: str = None
+    created_at: datetime = None
+    updated_at: datetime = None
 
     class Config:
         orm_mode = True
@@ -44,39 +74,97 @@ class FormResponse(BaseModel):
 # Define a mapping from string representation to SQLAlchemy column types
 type_mapping = {
     'Integer': Integer,
+    'SmallInteger': SmallInteger,
+    'BigInteger': BigInteger,
     'String': String,
     'DateTime': DateTime,
+    'Date': Date,
     'Boolean': Boolean,
     'Float': Float,
-    'Text': Text
+    'Numeric': Numeric,
+    'Text': Text,
+    'JSONB': JSONB,
 }
 
+# Parameterised field types, e.g. "String(64)", "Numeric(10,2)", "Enum(LOW,HIGH)", "Array(Integer)"
+FIELD_TYPE_PATTERN = re.compile(r'^\s*(\w+)\s*(?:\((.*)\))?\s*$')
+
+# Scalar types allowed as array items
+ARRAY_ITEM_TYPES = ('Integer', 'SmallInteger', 'BigInteger', 'String', 'Text', 'Float', 'Boolean', 'Date', 'DateTime')
+
+NUMERIC_TYPES = ('SmallInteger', 'Integer', 'BigInteger', 'Float', 'Numeric')
+TEMPORAL_TYPES = ('DateTime', 'Date')
+
+# Field types that can be indexed for full-text search
+SEARCHABLE_TYPES = ('String', 'Text')
+
+# Field types that can be aggregated into time-bucket rollups
+ROLLUP_TYPES = NUMERIC_TYPES
+
+# Columns added to every form table, which form fields cannot redefine
+SYSTEM_COLUMNS = ('id', 'approved_status', 'last_approved_by', 'last_approved_by_role', 'last_approved_at',
+                  'created_at', 'updated_at', 'created_by', 'updated_by', 'search_vector')
+
+# Text search configuration used for the generated search_vector column
+SEARCH_CONFIG = 'english'
+
+# Rows copied per batch when moving a form table to another shard
+MOVE_BATCH_SIZE = 5000
+
+# DDL gives up instead of queueing behind long-held catalogue locks, and the job is retried
+DDL_LOCK_TIMEOUT = '5s'
+FORM_JOB_MAX_ATTEMPTS = 5
+FORM_JOB_POLL_SECONDS = 2
+
+# Namespace of the advisory locks that serialize jobs per form
+FORM_JOB_LOCK_NAMESPACE = 720036
+
+# Quotes identifiers without doubling percent signs; statements embedding them
+# are escaped for the driver's paramstyle when they are compiled
+_identifier_preparer = postgresql.dialect(paramstyle='named').identifier_preparer
+
+_form_job_wakeup = threading.Event()
+
 
 # Read all forms
 @router.get("/forms", response_model=List[FormResponse])
 def get_forms(db: Session = Depends(get_db)):
-    forms = db.query(Form).all()
-    return forms
+    stmt = select(Form.id, Form.name, Form.fields, Form.created_by, Form.description, Form.searchable_fields, Form.rollup_fields, Form.shard, Form.provisioning_status)
+    return fast_json_response(db.execute(stmt))
 
 # Read a single form by ID
 @router.get("/forms/{form_id}", response_model=FormResponse)
 def get_form(form_id: int, db: Session = Depends(get_db)):
     form = db.query(Form).filter(Form.id == form_id).first()
-    _ = create_table_from_form(form, db)
     if form is None:
         raise HTTPException(status_code=404, detail="Form not found")
     return form
 
-# Update a form by ID
+# Update a form by ID. New fields are added to the table by a background job,
+# see /form-jobs/{job_id}; renames and changes to existing fields are rejected.
 @router.put("/forms/{form_id}", response_model=FormResponse)
-def update_form(form_id: int, form_update: FormUpdate, db: Session = Depends(get_db)):
+def update_form(form_id: int, form_update: FormUpdate, response: Response, db: Session = Depends(get_db)):
     form = db.query(Form).filter(Form.id == form_id).first()
     if form is None:
         raise HTTPException(status_code=404, detail="Form not found")
-    
-    form.name = form_update.table_name
-    form.fields = form_update.fields
+    if form_update.table_name != form.name:
+        raise HTTPException(status_code=400, detail="Forms cannot be renamed")
+    changed = [field_name for field_name, field_type in form.fields.items() if form_update.fields.get(field_name) != field_type]
+    if changed:
+        raise HTTPException(status_code=400, detail=f"Fields cannot be removed or change type: {', '.join(changed)}")
+    new_fields = {field_name: field_type for field_name, field_type in form_update.fields.items() if field_name not in form.fields}
+    if not new_fields:
+        return form
+    validate_field_types(form.name, new_fields)
+    if form.provisioning_status != 'applied':
+        raise HTTPException(status_code=409, detail=f"Form {form.name} is {form.provisioning_status}, retry once it is applied")
+
+    job = enqueue_form_job(form.id, 'alter', {"fields": new_fields}, db)
     db.commit()
+    _form_job_wakeup.set()
+    logger.info(f"FORM {form.name} UPDATED - NEW FIELDS QUEUED AS JOB {job.id}")
+    response.status_code = 202
+    response.headers["Location"] = f"/api/form-jobs/{job.id}"
     db.refresh(form)
     return form
 
@@ -89,30 +177,63 @@ def delete_form(form_id: int, db: Session = Depends(get_db)):
     
     db.delete(form)
     db.commit()
+    invalidate_form(form.name)
     return form
 
 
-# Create a form
-@router.post("/forms", response_model=FormResponse)
-def create_form(form: FormCreate, db: Session = Depends(get_db)):
-    db_form = Form(name=form.table_name, fields=form.fields, created_by=form.created_by, description=form.desciption)
+# Create a form. The table is created by a background job, see /form-jobs/{job_id}
+@router.post("/forms", response_model=FormResponse, status_code=202)
+def create_form(form: FormCreate, response: Response, db: Session = Depends(get_db)):
+    validate_field_types(form.table_name, form.fields)
+    for field_name in form.searchable_fields:
+        if field_base_type(form.fields.get(field_name)) not in SEARCHABLE_TYPES:
+            raise HTTPException(status_code=400, detail=f"Field {field_name} is not a String or Text field and cannot be searchable")
+    for field_name in form.rollup_fields:
+        if field_base_type(form.fields.get(field_name)) not in ROLLUP_TYPES:
+            raise HTTPException(status_code=400, detail=f"Field {field_name} is not a numeric field and cannot be rolled up")
+    try:
+        get_shard_engine(form.shard)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    db_form = Form(name=form.table_name, fields=form.fields, created_by=form.created_by, description=form.desciption,
+                   searchable_fields=form.searchable_fields or None, rollup_fields=form.rollup_fields or None,
+                   shard=form.shard, provisioning_status='pending')
     db.add(db_form)
+    db.flush()
+    job = enqueue_form_job(db_form.id, 'create', None, db)
     db.commit()
     db.refresh(db_form)
-    table = create_table_from_form(db_form, db)
-    logger.info(f"TABLE CREATED - {table}")
+    invalidate_form(db_form.name)
+    _form_job_wakeup.set()
+    logger.info(f"FORM {db_form.name} CREATED - TABLE QUEUED AS JOB {job.id}")
+    response.headers["Location"] = f"/api/form-jobs/{job.id}"
     return db_form
 
 
-def create_table_from_form(form, db):
+def create_table_from_form(form, db, shard=None):
     """
     Create a dynamic table from the form definition and add additional fields.
+
+    The table is created on the form's shard, or on the given shard when moving it.
     """
+    shard = shard or form.shard or PRIMARY_SHARD
     metadata = MetaData()
+    with get_shard_engine(shard).begin() as connection:
+        # Fail fast rather than queue behind (and block) other catalogue lock holders
+        connection.execute(text(f"SET LOCAL lock_timeout = '{DDL_LOCK_TIMEOUT}'"))
+        return _create_form_table(form, shard, metadata, connection)
+
+
+def _create_form_table(form, shard, metadata, bind):
+    # users and roles only exist on the primary, so other shards cannot reference them
+    if shard == PRIMARY_SHARD:
+        # Ensure referenced tables exist
+        users_table = Table('users', metadata, autoload_with=bind)  # noqa: F841
+        roles_table = Table('roles', metadata, autoload_with=bind)  # noqa: F841
 
-    # Ensure referenced tables exist
-    users_table = Table('users', metadata, autoload_with=db.get_bind())  # noqa: F841
-    roles_table = Table('roles', metadata, autoload_with=db.get_bind())  # noqa: F841
+    def user_reference(table_name):
+        return [ForeignKey(f'{table_name}.id')] if shard == PRIMARY_SHARD else []
 
     columns = [
         Column('id', Integer, primary_key=True, autoincrement=True)  # Add auto-incremented primary key
@@ -120,22 +241,367 @@ def create_table_from_form(form, db):
     # {"name":"arpit1","age":24,"bool":false}
 
     for field_name, field_type in form.fields.items():
-        column_type = type_mapping.get(field_type)
-        if column_type:
-            columns.append(Column(field_name, column_type))
+        column_type = resolve_column_type(field_type, f'{form.name}_{field_name}_enum')
+        if column_type is None:
+            raise ValueError(f"Field {field_name} has unsupported type {field_type!r}")
+        columns.append(Column(field_name, column_type))
     
     # Add the additional fields
     columns.extend([
         Column('approved_status', SqlEnum(ApprovedStatusEnum), default="PENDING"),
-        Column('last_approved_by', Integer, ForeignKey('users.id'), nullable=True),
-        Column('last_approved_by_role', Integer, ForeignKey('roles.id'), nullable=True),
+        Column('last_approved_by', Integer, *user_reference('users'), nullable=True),
+        Column('last_approved_by_role', Integer, *user_reference('roles'), nullable=True),
         Column('last_approved_at', DateTime, nullable=True),
         Column('created_at', DateTime, nullable=False, default=datetime.now),
         Column('updated_at', DateTime, nullable=False, default=datetime.now, onupdate=datetime.now),
-        Column('created_by', Integer, ForeignKey('users.id'), nullable=True),
-        Column('updated_by', Integer, ForeignKey('users.id'), nullable=True)
+        Column('created_by', Integer, *user_reference('users'), nullable=True),
+        Column('updated_by', Integer, *user_reference('users'), nullable=True)
     ])
-    
-    table = Table(form.name, metadata, *columns)
-    metadata.create_all(db.get_bind())
+
+    # Maintain a generated tsvector over the searchable fields, backed by a GIN index
+    indexes = []
+    if form.searchable_fields:
+        columns.append(
+            Column('search_vector', TSVECTOR, Computed(search_vector_expression(form.searchable_fields), persisted=True))
+        )
+        indexes.append(Index(f'ix_{form.name}_search_vector', 'search_vector', postgresql_using='gin'))
+
+    table = Table(form.name, metadata, *columns, *indexes)
+    metadata.create_all(bind)
     return table
+
+
+# Move a form table to another shard, as a background job
+@router.post("/forms/{form_id}/move", response_model=FormJobResponse, status_code=202)
+def move_form(form_id: int, form_move: FormMove, response: Response, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_admin)):
+    form = db.query(Form).filter(Form.id == form_id).first()
+    if form is None:
+        raise HTTPException(status_code=404, detail="Form not found")
+    if form.provisioning_status != 'applied':
+        raise HTTPException(status_code=409, detail=f"Form {form.name} is {form.provisioning_status}, only applied forms can be moved")
+    if form_move.shard == form.shard:
+        raise HTTPException(status_code=400, detail=f"Form is already on shard {form.shard}")
+    try:
+        get_shard_engine(form_move.shard)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job = enqueue_form_job(form.id, 'move', {"shard": form_move.shard, "previous_status": form.provisioning_status}, db)
+    db.commit()
+    db.refresh(job)
+    _form_job_wakeup.set()
+    response.headers["Location"] = f"/api/form-jobs/{job.id}"
+    return job
+
+
+def move_form_table(form, target_shard, db):
+    """
+    Move a form table to another shard with a streaming copy and a short cutover.
+
+    The form is first marked 'moving', which no worker caches, so that by the
+    cutover every worker resolves its placement per request. Rows are then copied
+    in id order while the source stays writable. The cutover locks the source,
+    copies the rows written by transactions the copy may not have seen (by xmin),
+    commits them on the target, switches the form's placement and only then
+    renames the source table and releases its lock, so that requests that still
+    resolved the old placement fail instead of diverging.
+    """
+    if form.shard == target_shard:
+        # An earlier attempt switched the placement but could not rename the source
+        logger.warning(f"FORM {form.name} IS ALREADY ON {target_shard}, LEAVING THE OLD TABLE IN PLACE")
+        form.provisioning_status = 'applied'
+        return
+
+    form.provisioning_status = 'moving'
+    db.commit()
+    invalidate_form(form.name)
+    moving_since = time.monotonic()
+
+    source = get_shard_engine(form.shard)
+    target = get_shard_engine(target_shard)
+    source_table = Table(form.name, MetaData(), autoload_with=source)
+    target_table = create_table_from_form(form, db, shard=target_shard)
+    column_names = [column.name for column in source_table.c if column.name != 'search_vector']
+
+    def copy_rows(source_conn, target_conn, stmt):
+        result = source_conn.execution_options(stream_results=True, yield_per=MOVE_BATCH_SIZE).execute(stmt)
+        for partition in result.partitions():
+            rows = [dict(zip(column_names, row)) for row in partition]
+            insert_stmt = pg_insert(target_table)
+            target_conn.execute(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=['id'],
+                    set_={name: insert_stmt.excluded[name] for name in column_names if name != 'id'},
+                ),
+                rows,
+            )
+
+    source_columns = [source_table.c[name] for name in column_names]
+    logger.info(f"MOVING FORM {form.name} FROM {form.shard} TO {target_shard}")
+    with source.connect() as source_conn, target.begin() as target_conn:
+        # Transactions older than the oldest one still running are all visible to the copy
+        copy_xmin = source_conn.execute(text("SELECT txid_snapshot_xmin(txid_current_snapshot())")).scalar()
+        copy_rows(source_conn, target_conn, select(*source_columns).order_by(source_table.c.id))
+
+    # Wait until no worker can still hold the form in its cache with the old placement
+    time.sleep(max(0, CACHE_TTL_SECONDS - (time.monotonic() - moving_since)))
+
+    with source.begin() as source_conn:
+        source_conn.execute(text(f"SET LOCAL lock_timeout = '{DDL_LOCK_TIMEOUT}'"))
+        # ACCESS EXCLUSIVE up front, so the rename below cannot queue behind readers
+        source_conn.execute(text(f'LOCK TABLE {text_identifier(form.name)} IN ACCESS EXCLUSIVE MODE'))
+
+        with target.begin() as target_conn:
+            # Rows inserted or updated by transactions that may have committed after the copy
+            # started; xmin is compared by age so that the 32-bit xid wraparound is handled
+            delta = (
+                select(*source_columns).
+                where(text("age(xmin) <= age(CAST(:copy_xmin AS xid))").bindparams(copy_xmin=str(copy_xmin % 2 ** 32))).
+                order_by(source_table.c.id)
+            )
+            copy_rows(source_conn, target_conn, delta)
+
+            # Explicit ids were copied, so move the id sequence past them
+            max_id = target_conn.execute(select(func.max(target_table.c.id))).scalar()
+            if max_id is not None:
+                target_conn.execute(
+                    text("SELECT setval(pg_get_serial_sequence(:table_name, 'id'), :max_id)"),
+                    {"table_name": quote_identifier(form.name), "max_id": max_id},
+                )
+
+        form.shard = target_shard
+        form.provisioning_status = 'applied'
+        db.commit()
+        moved_name = f"{form.name}_moved_{datetime.now():%Y%m%d%H%M%S}"
+        source_conn.execute(text(f'ALTER TABLE {text_identifier(form.name)} RENAME TO {text_identifier(moved_name)}'))
+
+    invalidate_form(form.name)
+    logger.info(f"FORM {form.name} MOVED TO {target_shard}")
+
+
+def add_form_fields(form, new_fields, db):
+    """
+    Add new nullable columns to a form table, then the fields to the form. The
+    columns are added idempotently, so a retry after a failed form commit is safe.
+    Bumping the form's updated_at makes every worker reflect the table again.
+    """
+    with get_shard_engine(form.shard).begin() as connection:
+        connection.execute(text(f"SET LOCAL lock_timeout = '{DDL_LOCK_TIMEOUT}'"))
+        for field_name, field_type in new_fields.items():
+            column_type = resolve_column_type(field_type, f'{form.name}_{field_name}_enum')
+            if isinstance(column_type, SqlEnum):
+                column_type.create(connection, checkfirst=True)
+            connection.execute(text(
+                f'ALTER TABLE {text_identifier(form.name)} ADD COLUMN IF NOT EXISTS '
+                f'{text_identifier(field_name)} {column_type.compile(dialect=_identifier_preparer.dialect)}'
+            ))
+    form.fields = {**form.fields, **new_fields}
+    logger.info(f"FORM {form.name} - ADDED FIELDS {', '.join(new_fields)}")
+
+
+def field_base_type(field_type):
+    """
+    Base type name of a field type, e.g. "Numeric" for "Numeric(10,2)".
+    """
+    match = FIELD_TYPE_PATTERN.match(field_type) if isinstance(field_type, str) else None
+    return match.group(1) if match else None
+
+
+def resolve_column_type(field_type, enum_name):
+    """
+    Resolve a form field type to a SQLAlchemy column type, or None if it is not supported.
+    """
+    match = FIELD_TYPE_PATTERN.match(field_type) if isinstance(field_type, str) else None
+    if not match:
+        return None
+    base, arguments = match.groups()
+    arguments = [argument.strip() for argument in arguments.split(',')] if arguments else []
+
+    if not arguments:
+        return type_mapping.get(base)
+    try:
+        if base == 'String' and len(arguments) == 1:
+            length = int(arguments[0])
+            return String(length) if length >= 1 else None
+        if base == 'Numeric' and len(arguments) in (1, 2):
+            precision, scale = int(arguments[0]), int(arguments[1]) if len(arguments) == 2 else 0
+            return Numeric(*[int(argument) for argument in arguments]) if 1 <= precision <= 1000 and 0 <= scale <= precision else None
+    except ValueError:
+        return None
+    if base == 'Enum' and all(arguments) and len(set(arguments)) == len(arguments):
+        # Native PostgreSQL enum, stored in 4 bytes per value
+        return SqlEnum(*arguments, name=enum_name)
+    if base == 'Array' and len(arguments) == 1 and arguments[0] in ARRAY_ITEM_TYPES:
+        return ARRAY(type_mapping[arguments[0]])
+    return None
+
+
+def validate_field_types(table_name, fields):
+    """
+    Reject a form definition with any field type that resolve_column_type does
+    not support, or with a field named like a system column.
+    """
+    for field_name, field_type in fields.items():
+        if field_name in SYSTEM_COLUMNS:
+            raise HTTPException(status_code=400, detail=f"Field {field_name} is reserved")
+        if resolve_column_type(field_type, f'{table_name}_{field_name}_enum') is None:
+            raise HTTPException(status_code=400, detail=f"Field {field_name} has unsupported type {field_type!r}")
+
+
+def quote_identifier(name):
+    """
+    Quote a user-supplied table or column name for hand-written SQL.
+    """
+    return _identifier_preparer.quote(name)
+
+
+def text_identifier(name):
+    """
+    quote_identifier for text() statements, where ":word" would otherwise be read as a bind parameter.
+    """
+    return quote_identifier(name).replace(':', '\\:')
+
+
+def search_document_expression(searchable_fields):
+    """
+    SQL expression concatenating the searchable fields into a single document.
+    """
+    return " || ' ' || ".join(f"coalesce({text_identifier(field_name)}, '')" for field_name in searchable_fields)
+
+
+def search_vector_expression(searchable_fields):
+    """
+    SQL expression for the generated search_vector column.
+    """
+    return f"to_tsvector('{SEARCH_CONFIG}', {search_document_expression(searchable_fields)})"
+
+
+# Status of a form DDL job
+@router.get("/form-jobs/{job_id}", response_model=FormJobResponse)
+def get_form_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.query(FormJob).filter(FormJob.id == job_id).first()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# Jobs of a form, newest first
+@router.get("/forms/{form_id}/jobs", response_model=List[FormJobResponse])
+def get_form_jobs(form_id: int, db: Session = Depends(get_db)):
+    return db.query(FormJob).filter(FormJob.form_id == form_id).order_by(FormJob.id.desc()).all()
+
+
+def enqueue_form_job(form_id, operation, arguments, db):
+    """
+    Queue a DDL job for a form in the caller's transaction.
+    """
+    job = FormJob(form_id=form_id, operation=operation, arguments=arguments, status='pending', attempts=0)
+    db.add(job)
+    db.flush()
+    return job
+
+
+def run_form_jobs(db):
+    """
+    Run due form jobs until none is left. A job only runs once every earlier
+    pending job of its form is done, and a per-form advisory lock (held on its
+    own connection, so the job may commit freely) keeps other workers off it.
+    Returns the number of jobs run.
+    """
+    processed = 0
+    while True:
+        earlier = aliased(FormJob)
+        candidates = (
+            db.query(FormJob.id, FormJob.form_id).
+            filter(FormJob.status == 'pending', FormJob.run_after <= func.now()).
+            filter(~db.query(earlier.id).filter(
+                earlier.form_id == FormJob.form_id, earlier.status == 'pending', earlier.id < FormJob.id
+            ).exists()).
+            order_by(FormJob.id).
+            limit(10).
+            all()
+        )
+        db.rollback()
+        ran = False
+        for job_id, form_id in candidates:
+            with engine.connect() as lock_connection:
+                locked = lock_connection.execute(
+                    text("SELECT pg_try_advisory_lock(:namespace, :form_id)"),
+                    {"namespace": FORM_JOB_LOCK_NAMESPACE, "form_id": form_id},
+                ).scalar()
+                if not locked:
+                    continue
+                try:
+                    job = db.query(FormJob).filter(FormJob.id == job_id, FormJob.status == 'pending').first()
+                    if job is not None:
+                        run_form_job(job, db)
+                        processed += 1
+                        ran = True
+                finally:
+                    lock_connection.execute(
+                        text("SELECT pg_advisory_unlock(:namespace, :form_id)"),
+                        {"namespace": FORM_JOB_LOCK_NAMESPACE, "form_id": form_id},
+                    )
+        if not ran:
+            return processed
+
+
+def run_form_job(job, db):
+    """
+    Run one job, recording success, a delayed retry or the final failure.
+    """
+    job.attempts += 1
+    db.commit()
+    job_id = job.id
+    form = db.query(Form).filter(Form.id == job.form_id).first()
+    logger.info(f"RUNNING FORM JOB {job_id} | {job.operation} {form.name} | ATTEMPT {job.attempts}")
+    try:
+        if job.operation == 'create':
+            create_table_from_form(form, db)
+            form.provisioning_status = 'applied'
+        elif job.operation == 'move':
+            move_form_table(form, job.arguments["shard"], db)
+        elif job.operation == 'alter':
+            add_form_fields(form, job.arguments["fields"], db)
+        else:
+            raise ValueError(f"Unknown form job operation {job.operation}")
+        job.status = 'applied'
+        job.error = None
+    except Exception as e:
+        db.rollback()
+        job = db.query(FormJob).filter(FormJob.id == job_id).first()
+        job.error = str(e)
+        logger.error(f"FORM JOB {job_id} FAILED - ATTEMPT {job.attempts}: {e}")
+        if job.attempts >= FORM_JOB_MAX_ATTEMPTS:
+            job.status = 'failed'
+            if job.operation == 'create':
+                form.provisioning_status = 'failed'
+            elif job.operation == 'move' and form.provisioning_status == 'moving':
+                # The form never left its shard
+                form.provisioning_status = job.arguments.get("previous_status", 'applied')
+        else:
+            # Exponential backoff: 2, 4, 8, ... seconds
+            job.run_after = datetime.now(timezone.utc) + timedelta(seconds=2 ** job.attempts)
+    db.commit()
+    invalidate_form(form.name)
+
+
+def start_form_job_worker():
+    """
+    Run form jobs in a background thread, right away when this worker queues
+    one and every FORM_JOB_POLL_SECONDS for jobs queued by other workers or
+    waiting for a retry.
+    """
+    def run():
+        while True:
+            _form_job_wakeup.wait(FORM_JOB_POLL_SECONDS)
+            _form_job_wakeup.clear()
+            db = SessionLocal()
+            try:
+                run_form_jobs(db)
+            except Exception as e:
+                logger.error(f"FORM JOB WORKER FAILED: {e}")
+            finally:
+                db.close()
+
+    threading.Thread(target=run, name="form-jobs", daemon=True).start()
@@ -0,0 +1,174 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.models import Form, FormRollup, FormRollupWatermark
+from src.database import get_db, get_shard_engine
+from src.utils import get_cached_form, get_cached_table, rows_to_dicts, start_periodic_job, FastJSONResponse
+from datetime import datetime, timedelta
+import logging
+import os
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Bucket sizes, finest first
+RESOLUTIONS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+# How often the rollups are refreshed, in seconds
+ROLLUP_REFRESH_SECONDS = int(os.getenv("ROLLUP_REFRESH_SECONDS", "60"))
+
+# Records younger than this are left for the next refresh, so that rows from
+# transactions still in flight are not skipped by the id watermark
+ROLLUP_LAG = timedelta(minutes=1)
+
+# Advisory lock key so that only one worker refreshes at a time
+ROLLUP_LOCK_KEY = 720033
+
+# Upper bound on the number of points returned by a rollup query
+MAX_ROLLUP_POINTS = 5000
+
+
+@router.get("/rollups/{table_name}/{field}")
+def get_rollup(table_name: str, field: str, start: datetime = None, end: datetime = None, max_points: int = 500, db: Session = Depends(get_db)):
+    """
+    Count / sum / min / max / avg of a numeric field per time bucket between start
+    and end, using the finest resolution that stays within max_points.
+    """
+    form = get_cached_form(table_name, db)
+    if form is None:
+        raise HTTPException(status_code=404, detail="Form not found")
+    if field not in (form.rollup_fields or []):
+        raise HTTPException(status_code=400, detail=f"Field {field} has no rollups")
+
+    if max_points < 1:
+        raise HTTPException(status_code=400, detail="max_points must be at least 1")
+    end = to_local_naive(end) if end else datetime.now()
+    start = to_local_naive(start) if start else end - timedelta(days=7)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    max_points = min(max_points, MAX_ROLLUP_POINTS)
+
+    resolution = choose_resolution(end - start, max_points)
+    stmt = (
+        select(
+            FormRollup.bucket, FormRollup.count, FormRollup.sum, FormRollup.min, FormRollup.max,
+            (FormRollup.sum / FormRollup.count).label('avg'),
+        ).
+        where(
+            FormRollup.form_id == form.id,
+            FormRollup.field == field,
+            FormRollup.resolution == resolution,
+            FormRollup.bucket >= func.date_trunc(resolution, start),
+            FormRollup.bucket < end,
+        ).
+        order_by(FormRollup.bucket).
+        limit(max_points)
+    )
+    return FastJSONResponse({"resolution": resolution, "points": rows_to_dicts(db.execute(stmt))})
+
+
+def to_local_naive(value: datetime):
+    """
+    Form tables store naive local timestamps, so aware query bounds are converted to local time.
+    """
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def choose_resolution(span: timedelta, max_points: int):
+    """
+    Finest resolution whose bucket count over span fits in max_points, falling back to days.
+    """
+    for resolution, size in RESOLUTIONS.items():
+        if span / size <= max_points:
+            return resolution
+    return "day"
+
+
+def refresh_rollups(db: Session):
+    """
+    Fold records added since each form's watermark into its rollups.
+    """
+    forms = db.query(Form.id, Form.name, Form.shard, Form.rollup_fields, Form.updated_at).filter(Form.provisioning_status == 'applied').all()
+    refreshed = 0
+    for form_id, name, shard, rollup_fields, version in forms:
+        if not rollup_fields:
+            continue
+        try:
+            refreshed += refresh_form_rollups(db, form_id, name, shard, rollup_fields, version)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"ROLLUPS OF FORM {name} NOT REFRESHED: {e}")
+    logger.info(f"ROLLUPS REFRESHED - {refreshed} new records")
+
+
+def refresh_form_rollups(db: Session, form_id: int, name: str, shard: str, rollup_fields, version=None):
+    """
+    Aggregate the records of one form between its watermark and the newest record
+    older than ROLLUP_LAG, merge them into the rollups and advance the watermark in
+    the same transaction. Returns the number of records covered.
+    """
+    bind = get_shard_engine(shard)
+    table = get_cached_table(name, db, bind=bind, version=version)
+    watermark = db.query(FormRollupWatermark.last_id).filter(FormRollupWatermark.form_id == form_id).scalar() or 0
+
+    with bind.connect() as connection:
+        new_watermark, records = connection.execute(
+            select(func.max(table.c.id), func.count()).
+            where(table.c.id > watermark, table.c.created_at < datetime.now() - ROLLUP_LAG)
+        ).one()
+        if new_watermark is None:
+            return 0
+
+        values = []
+        for resolution in RESOLUTIONS:
+            bucket = func.date_trunc(resolution, table.c.created_at)
+            aggregates = []
+            for field in rollup_fields:
+                column = table.c[field]
+                aggregates.extend([func.count(column), func.sum(column), func.min(column), func.max(column)])
+            rows = connection.execute(
+                select(bucket, *aggregates).
+                where(table.c.id > watermark, table.c.id <= new_watermark).
+                group_by(bucket)
+            ).fetchall()
+            for row in rows:
+                for index, field in enumerate(rollup_fields):
+                    count, total, minimum, maximum = row[1 + index * 4:5 + index * 4]
+                    if count:
+                        values.append({
+                            "form_id": form_id, "field": field, "resolution": resolution, "bucket": row[0],
+                            "count": count, "sum": total, "min": minimum, "max": maximum,
+                        })
+
+    rollups = FormRollup.__table__
+    if values:
+        stmt = pg_insert(rollups)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['form_id', 'field', 'resolution', 'bucket'],
+            set_={
+                'count': rollups.c['count'] + stmt.excluded['count'],
+                'sum': rollups.c['sum'] + stmt.excluded['sum'],
+                'min': func.least(rollups.c['min'], stmt.excluded['min']),
+                'max': func.greatest(rollups.c['max'], stmt.excluded['max']),
+                'updated_at': func.now(),
+            },
+        ), values)
+
+    stmt = pg_insert(FormRollupWatermark.__table__).values(form_id=form_id, last_id=new_watermark)
+    db.execute(stmt.on_conflict_do_update(index_elements=['form_id'], set_={'last_id': new_watermark, 'updated_at': func.now()}))
+    db.commit()
+    return records
+
+
+def start_rollup_thread():
+    """
+    Periodically refresh the rollups in the background.
+    """
+    return start_periodic_job("rollup-refresh", ROLLUP_REFRESH_SECONDS, ROLLUP_LOCK_KEY, refresh_rollups)
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
-from src.models import User, Role, ActionEnum
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from src.models import User, Role, ActionEnum, hash_passwords
 from src.database import get_db
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from typing import List
+import csv
+import io
 from datetime import datetime, timedelta
-from src.utils import create_access_token, get_current_active_admin, get_current_active_user
+from src.utils import create_access_token, get_current_active_admin, get_current_active_user, fast_json_response
 import logging
 
 # Create a logger
@@ -13,6 +17,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Number of users inserted per INSERT statement during bulk import
+USER_IMPORT_BATCH_SIZE = 1000
+
 # Pydantic models for request and response
 class UserCreate(BaseModel):
     name: str
@@ -24,6 +31,13 @@ class UserCreate(BaseModel):
     role_id: int
     password: str
 
+class UserImportResult(BaseModel):
+    row: int
+    status: str
+    id: int = None
+    email: str = None
+    errors: list = None
+
 class UserUpdate(BaseModel):
     name: str
     email: str
@@ -81,6 +95,24 @@ def create_user(user_payload: UserCreate, db: Session = Depends(get_db)):
     return user
 
 
+@router.post("/users/bulk", response_model=List[UserImportResult])
+def bulk_create_users(rows: List[dict], db: Session = Depends(get_db)):
+    logger.info(f"BULK IMPORTING {len(rows)} USERS")
+    return import_users(rows, db)
+
+
+@router.post("/users/bulk/csv", response_model=List[UserImportResult])
+def bulk_create_users_csv(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    try:
+        content = file.file.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV file must be UTF-8 encoded")
+    # Empty CSV cells mean "not provided" so the UserCreate defaults apply
+    rows = [{key: value for key, value in row.items() if value != ''} for row in csv.DictReader(io.StringIO(content))]
+    logger.info(f"BULK IMPORTING {len(rows)} USERS FROM {file.filename}")
+    return import_users(rows, db)
+
+
 @router.post("/token")
 def authenticate_user(email: str, password: str, db: Session = Depends(get_db)):
     user = User.authenticate(db, email, password)
@@ -95,8 +127,8 @@ def authenticate_user(email: str, password: str, db: Session = Depends(get_db)):
 
 @router.get("/users", response_model=List[UserResponse])
 def get_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
-    return users
+    stmt = select(User.id, User.name, User.email, User.phonenumber, User.is_admin, User.address, User.date_of_birth, User.role_id)
+    return fast_json_response(db.execute(stmt))
 
 @router.get("/users/{user_id}", response_model=UserResponse)
 def get_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
@@ -140,8 +172,7 @@ def create_role(role: RoleCreate, db: Session = Depends(get_db)):
 @router.get("/roles", response_model=List[RoleResponse])
 def get_roles(db: Session = Depends(get_db)):
     # logger.info(f"CURRENT USER: {current_user}")
-    roles = db.query(Role).all()
-    return roles
+    return fast_json_response(db.execute(select(Role.id, Role.role, Role.actions)))
 
 @router.get("/roles/{role_id}", response_model=RoleResponse)
 def get_role(role_id: int, db: Session = Depends(get_db)):
@@ -173,6 +204,87 @@ def delete_role(role_id: int, db: Session = Depends(get_db), current_user: User
     db.commit()
     return role
 
+def import_users(rows: List[dict], db: Session):
+    """
+    Validate, hash and insert many users in a single transaction.
+
+    Every row is validated against UserCreate, checked for email/phone
+    conflicts (with existing users and within the payload) and for an existing
+    role before anything is written. Valid rows are inserted in batches;
+    invalid rows are reported back.
+    """
+    results = [None] * len(rows)
+    valid = []
+    for index, row in enumerate(rows):
+        # csv.DictReader files cells beyond the header under a None key
+        if any(not isinstance(key, str) for key in row):
+            results[index] = {"row": index, "status": "error", "errors": [{"loc": [], "msg": "Row has more cells than the header", "type": "value_error"}]}
+            continue
+        try:
+            valid.append((index, UserCreate(**row)))
+        except TypeError as e:
+            results[index] = {"row": index, "status": "error", "errors": [{"loc": [], "msg": str(e), "type": "type_error"}]}
+        except ValidationError as e:
+            # Only location and message: pydantic v2 also echoes the input row, plaintext password included
+            errors = [{"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]} for error in e.errors()]
+            results[index] = {"row": index, "status": "error", "errors": errors}
+
+    # One query for all conflicts with existing users, one for the referenced roles
+    emails = {payload.email for _, payload in valid}
+    phonenumbers = {payload.phonenumber for _, payload in valid}
+    taken_emails, taken_phonenumbers, known_role_ids = set(), set(), set()
+    if valid:
+        existing = db.query(User.email, User.phonenumber).filter(
+            or_(User.email.in_(emails), User.phonenumber.in_(phonenumbers))
+        ).all()
+        taken_emails = {email for email, _ in existing}
+        taken_phonenumbers = {phonenumber for _, phonenumber in existing}
+        role_ids = {payload.role_id for _, payload in valid}
+        known_role_ids = {role_id for role_id, in db.query(Role.id).filter(Role.id.in_(role_ids)).all()}
+
+    to_create = []
+    for index, payload in valid:
+        errors = []
+        if payload.email in taken_emails:
+            errors.append({"loc": ["email"], "msg": "Email already registered"})
+        if payload.phonenumber in taken_phonenumbers:
+            errors.append({"loc": ["phonenumber"], "msg": "Phone number already registered"})
+        if payload.role_id not in known_role_ids:
+            errors.append({"loc": ["role_id"], "msg": "Role not found"})
+        if errors:
+            results[index] = {"row": index, "status": "error", "email": payload.email, "errors": errors}
+            continue
+        # Later rows with the same email/phone conflict with this one
+        taken_emails.add(payload.email)
+        taken_phonenumbers.add(payload.phonenumber)
+        to_create.append((index, payload))
+
+    # Hashing takes a while; do not keep a pool connection idle in a transaction meanwhile
+    db.rollback()
+    password_hashes = hash_passwords([payload.password for _, payload in to_create])
+    values = []
+    for (index, payload), password_hash in zip(to_create, password_hashes):
+        user_values = payload.dict(exclude={"password"})
+        user_values["password_hash"] = password_hash
+        values.append(user_values)
+
+    created_ids = {}
+    try:
+        for start in range(0, len(values), USER_IMPORT_BATCH_SIZE):
+            batch = values[start:start + USER_IMPORT_BATCH_SIZE]
+            result = db.execute(insert(User).returning(User.id, User.email), batch)
+            created_ids.update({email: user_id for user_id, email in result})
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"BULK USER IMPORT FAILED: {e}")
+        raise HTTPException(status_code=409, detail="Users conflict with concurrently created users, nothing was imported")
+
+    for index, payload in to_create:
+        results[index] = {"row": index, "status": "created", "id": created_ids[payload.email], "email": payload.email}
+
+    return results
+
 @router.get("/test/users/me", response_model=UserResponse, dependencies=[Depends(get_current_active_user)])
 def read_users_me(current_user: User = Depends(get_current_active_user)):
     logger.info(f"CURRENT USER: {current_user}")
@@ -1,2 +1,7 @@
 from .jwt_utils import create_access_token, requires_auth  # noqa: F401
-from .dependencies import get_current_active_admin, get_current_active_user  # noqa: F401
\ No newline at end of file
+from .dependencies import get_current_active_admin, get_current_active_user  # noqa: F401
+from .cache import CACHE_TTL_SECONDS, warm_caches, get_cached_form, get_cached_table, invalidate_form  # noqa: F401
+from .admission import admission_control, admission_stats  # noqa: F401
+from .jobs import start_periodic_job  # noqa: F401
+from .idempotency import idempotency_middleware, start_idempotency_purge_thread  # noqa: F401
+from .responses import rows_to_dicts, fast_json_response, FastJSONResponse  # noqa: F401
\ No newline at end of file
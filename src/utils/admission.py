@@ -0,0 +1,174 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse
+import jwt
+from .jwt_utils import SECRET_KEY, ALGORITHM
+from src import database
+from collections import OrderedDict
+import asyncio
+import logging
+import math
+import time
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Concurrency limits per route class. Lower priority values are more important:
+# once the connection pool is exhausted, classes with priority >= SHED_PRIORITY are
+# rejected immediately instead of queueing. Requests that cannot get a slot within
+# the class latency budget are rejected with 503.
+ROUTE_CLASSES = {
+    "insert": {"concurrency": 5, "max_queue": 50, "latency_budget": 2.0, "priority": 0},
+    "approve": {"concurrency": 3, "max_queue": 30, "latency_budget": 2.0, "priority": 0},
+    "read": {"concurrency": 5, "max_queue": 50, "latency_budget": 1.0, "priority": 1},
+    "admin": {"concurrency": 2, "max_queue": 10, "latency_budget": 0.5, "priority": 2},
+}
+SHED_PRIORITY = 1
+
+# Token buckets (requests per second, burst size) for write-heavy and credential endpoints
+RATE_LIMITS = {
+    "insert": {"rate": 5.0, "burst": 20},
+    "token": {"rate": 0.5, "burst": 5},
+}
+MAX_BUCKETS = 10000
+
+EXEMPT_PATHS = ("/", "/admission", "/docs", "/redoc", "/openapi.json")
+
+_semaphores = {}
+_waiting = {name: 0 for name in ROUTE_CLASSES}
+_in_flight = {name: 0 for name in ROUTE_CLASSES}
+_buckets = OrderedDict()  # (limit name, key) -> [tokens, last refill], least recently used first
+
+
+def classify_request(method: str, path: str):
+    """
+    Map a request to one of the ROUTE_CLASSES.
+    """
+    if path.endswith("/approve"):
+        return "approve"
+    if path.endswith("/insert") or (method == "POST" and path in ("/api/users", "/api/users/bulk", "/api/users/bulk/csv")):
+        return "insert"
+    # Record updates are data writes too
+    if method == "PUT" and path.startswith("/api/data/"):
+        return "insert"
+    # Batch fetches and aggregations are POSTs that only read
+    if method in ("GET", "HEAD") or path == "/api/token" or path.endswith(("/batch", "/aggregate")):
+        return "read"
+    return "admin"
+
+
+def pool_exhausted():
+    return database.engine.pool.checkedout() >= database.POOL_SIZE + database.MAX_OVERFLOW
+
+
+def take_token(limit_name: str, key: str):
+    """
+    Consume a token from the bucket for key. Returns 0 on success, otherwise the
+    number of seconds until a token becomes available.
+    """
+    limit = RATE_LIMITS[limit_name]
+    now = time.monotonic()
+    bucket = _buckets.get((limit_name, key))
+    if bucket is None:
+        # Evict the least recently used buckets only; clearing them all would
+        # reset everyone's limit
+        while len(_buckets) >= MAX_BUCKETS:
+            _buckets.popitem(last=False)
+        bucket = _buckets[(limit_name, key)] = [limit["burst"], now]
+    else:
+        _buckets.move_to_end((limit_name, key))
+    tokens = min(limit["burst"], bucket[0] + (now - bucket[1]) * limit["rate"])
+    bucket[1] = now
+    if tokens >= 1:
+        bucket[0] = tokens - 1
+        return 0
+    bucket[0] = tokens
+    return (1 - tokens) / limit["rate"]
+
+
+def authenticated_subject(request: Request):
+    """
+    "user:<sub>" for a request carrying a valid bearer token, otherwise None.
+    """
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        try:
+            payload = jwt.decode(auth_header.split(" ")[1], SECRET_KEY, algorithms=[ALGORITHM])
+            return f"user:{payload.get('sub')}"
+        except Exception:
+            pass
+    return None
+
+
+def rate_limit_key(request: Request, limit_name: str):
+    """
+    Identify the caller: the client address for the token endpoint (so guessing
+    across many emails is limited and nobody can exhaust another user's bucket),
+    the token subject for authenticated requests, the client address otherwise.
+    """
+    client_address = request.client.host if request.client else "unknown"
+    if limit_name == "token":
+        return client_address
+    return authenticated_subject(request) or client_address
+
+
+def reject(status_code: int, detail: str, retry_after: float):
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def admission_control(request: Request, call_next):
+    """
+    HTTP middleware bounding concurrent requests per route class, shedding
+    low-priority work while the DB pool is exhausted and rate limiting inserts
+    per user and token requests per client address.
+    """
+    path = request.url.path
+    if path in EXEMPT_PATHS:
+        return await call_next(request)
+
+    limit_name = "token" if path == "/api/token" else "insert" if path.endswith("/insert") else None
+    if limit_name:
+        wait = take_token(limit_name, rate_limit_key(request, limit_name))
+        if wait:
+            return reject(429, "Rate limit exceeded", wait)
+
+    route_class = classify_request(request.method, path)
+    config = ROUTE_CLASSES[route_class]
+    if config["priority"] >= SHED_PRIORITY and pool_exhausted():
+        logger.warning(f"SHEDDING {route_class} REQUEST {request.method} {path} | POOL EXHAUSTED")
+        return reject(503, "Server busy, try again later", config["latency_budget"])
+    if _waiting[route_class] >= config["max_queue"]:
+        logger.warning(f"SHEDDING {route_class} REQUEST {request.method} {path} | QUEUE FULL")
+        return reject(503, "Server busy, try again later", config["latency_budget"])
+
+    semaphore = _semaphores.get(route_class)
+    if semaphore is None:
+        semaphore = _semaphores[route_class] = asyncio.Semaphore(config["concurrency"])
+
+    _waiting[route_class] += 1
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=config["latency_budget"])
+    except asyncio.TimeoutError:
+        logger.warning(f"SHEDDING {route_class} REQUEST {request.method} {path} | LATENCY BUDGET EXCEEDED")
+        return reject(503, "Server busy, try again later", config["latency_budget"])
+    finally:
+        _waiting[route_class] -= 1
+
+    _in_flight[route_class] += 1
+    try:
+        return await call_next(request)
+    finally:
+        _in_flight[route_class] -= 1
+        semaphore.release()
+
+
+def admission_stats():
+    return {
+        "in_flight": dict(_in_flight),
+        "waiting": dict(_waiting),
+        "pool_checked_out": database.engine.pool.checkedout(),
+        "pool_capacity": database.POOL_SIZE + database.MAX_OVERFLOW,
+    }
@@ -0,0 +1,91 @@
+from sqlalchemy import MetaData, Table, inspect
+from sqlalchemy.orm import Session
+from src.models import Form
+from src.database import get_shard_engine
+import logging
+import threading
+import time
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Forms can be changed through the API by any worker, so they are only
+# trusted for a short while. Roles are not cached: they decide authorization.
+# Reflected tables are kept until the form's updated_at changes.
+CACHE_TTL_SECONDS = 60
+
+_lock = threading.Lock()
+_forms = {}  # form name -> (loaded_at, detached Form)
+_tables = {}  # table name -> (form updated_at, reflected Table)
+
+
+def _fresh(entry):
+    return entry is not None and time.monotonic() - entry[0] < CACHE_TTL_SECONDS
+
+
+def warm_caches(db: Session):
+    """
+    Load every form and form table definition in one pass so the first
+    requests after startup do not each pay for their own catalogue lookups.
+    """
+    forms = db.query(Form).all()
+    for form in forms:
+        db.expunge(form)
+
+    # A single reflect() call per shard batches the catalogue queries for its form tables
+    tables = {}
+    for shard in {form.shard for form in forms}:
+        bind = get_shard_engine(shard)
+        table_names = [form.name for form in forms if form.shard == shard]
+        existing = set(inspect(bind).get_table_names())
+        metadata = MetaData()
+        metadata.reflect(bind=bind, only=[name for name in table_names if name in existing])
+        tables.update({
+            form.name: (form.updated_at, metadata.tables[form.name])
+            for form in forms if form.shard == shard and form.name in metadata.tables
+        })
+
+    now = time.monotonic()
+    with _lock:
+        _forms.update({form.name: (now, form) for form in forms})
+        _tables.update(tables)
+    logger.info(f"CACHES WARMED - {len(forms)} forms, {len(tables)} tables")
+
+
+def get_cached_form(name: str, db: Session):
+    """
+    Return the (detached) form with the given name, or None.
+    """
+    entry = _forms.get(name)
+    # Forms still being provisioned or moved are re-read until their table is ready
+    if _fresh(entry) and entry[1].provisioning_status == 'applied':
+        return entry[1]
+    form = db.query(Form).filter(Form.name == name).first()
+    if form is None:
+        return None
+    db.expunge(form)
+    with _lock:
+        _forms[name] = (time.monotonic(), form)
+    return form
+
+
+def get_cached_table(table_name: str, db: Session, bind=None, version=None):
+    """
+    Return the reflected Table for a form table, reflecting it from bind
+    (the primary database by default) on first use and again whenever version
+    (the form's updated_at, which changes when fields are added) differs.
+    """
+    entry = _tables.get(table_name)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    table = Table(table_name, MetaData(), autoload_with=bind or db.get_bind())
+    with _lock:
+        _tables[table_name] = (version, table)
+    return table
+
+
+def invalidate_form(name: str):
+    with _lock:
+        _forms.pop(name, None)
+        _tables.pop(name, None)
+
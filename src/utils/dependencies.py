@@ -37,6 +37,6 @@ def get_current_active_user(current_user: User = Depends(get_current_user)):
     raise HTTPException(status_code=400, detail="Inactive user")
 
 def get_current_active_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role == "admin":
+    if current_user.is_admin:
         return current_user
     raise HTTPException(status_code=403, detail="Not enough permissions")
\ No newline at end of file
@@ -0,0 +1,206 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, select, delete, text, func
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.models import IdempotencyKey
+from src.database import SQLALCHEMY_DATABASE_URL
+from .admission import authenticated_subject, ROUTE_CLASSES
+from .jobs import start_periodic_job
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
+import threading
+import time
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+# Writes that honour the Idempotency-Key header
+IDEMPOTENT_PATH_SUFFIXES = ("/insert", "/approve")
+
+# Responses that are replayed: successes, and client errors that a retry of the
+# same request would get again. Others (401, 403, 409, 429, ...) can succeed later.
+STORED_CLIENT_ERRORS = (400, 404, 422)
+
+# Longer keys are rejected; they would not fit in the unique index
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+# How long a duplicate waits for the first attempt before getting a 409
+IDEMPOTENCY_LOCK_TIMEOUT = '5s'
+
+# SQLSTATE raised when lock_timeout expires
+LOCK_NOT_AVAILABLE = '55P03'
+
+# How long a stored response is replayed
+IDEMPOTENCY_TTL = timedelta(hours=24)
+
+# Most recently used keys kept in memory by each worker, in front of the table
+IDEMPOTENCY_LRU_SIZE = 10000
+
+# Expired keys are purged from the table this often
+IDEMPOTENCY_PURGE_SECONDS = 3600
+IDEMPOTENCY_PURGE_LOCK_KEY = 720038
+
+# Each keyed request holds a connection for its advisory lock while it runs.
+# They come from their own pool, one per admitted insert / approve request, so
+# they never starve the request sessions of the main pool.
+_lock_engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_size=ROUTE_CLASSES["insert"]["concurrency"] + ROUTE_CLASSES["approve"]["concurrency"],
+    max_overflow=0,
+    pool_timeout=1,
+)
+
+_lru_lock = threading.Lock()
+_lru = OrderedDict()  # key -> (expires_at monotonic, fingerprint, status code, body)
+
+
+def _lru_get(key):
+    with _lru_lock:
+        entry = _lru.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _lru[key]
+            return None
+        _lru.move_to_end(key)
+        return entry
+
+
+def _lru_put(key, fingerprint, status_code, body, ttl_seconds):
+    with _lru_lock:
+        _lru[key] = (time.monotonic() + ttl_seconds, fingerprint, status_code, body)
+        _lru.move_to_end(key)
+        while len(_lru) > IDEMPOTENCY_LRU_SIZE:
+            _lru.popitem(last=False)
+
+
+def _replay(fingerprint, stored_fingerprint, status_code, body):
+    if fingerprint != stored_fingerprint:
+        return JSONResponse(status_code=422, content={"detail": "Idempotency-Key was already used with a different request body"})
+    return Response(content=body, status_code=status_code, media_type="application/json", headers={"Idempotent-Replayed": "true"})
+
+
+def _acquire(key):
+    """
+    Take the advisory lock for key, waiting up to IDEMPOTENCY_LOCK_TIMEOUT for a
+    concurrent first attempt to finish. Returns ("replay", row) if a response is
+    already stored, otherwise ("proceed", connection) with the lock held on connection.
+    """
+    connection = _lock_engine.connect()
+    try:
+        connection.execute(text("SELECT set_config('lock_timeout', :timeout, true)"), {"timeout": IDEMPOTENCY_LOCK_TIMEOUT})
+        connection.execute(text("SELECT pg_advisory_lock(hashtextextended(:key, 0))"), {"key": key})
+        row = connection.execute(
+            select(IdempotencyKey.fingerprint, IdempotencyKey.status_code, IdempotencyKey.response_body, IdempotencyKey.expires_at).
+            where(IdempotencyKey.key == key, IdempotencyKey.expires_at > func.now())
+        ).first()
+        connection.commit()
+    except Exception:
+        connection.close()
+        raise
+    if row is not None:
+        _release(connection, key)
+        return "replay", row
+    return "proceed", connection
+
+
+def _release(connection, key):
+    try:
+        connection.execute(text("SELECT pg_advisory_unlock(hashtextextended(:key, 0))"), {"key": key})
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def _store(connection, key, fingerprint, status_code, body):
+    stmt = pg_insert(IdempotencyKey.__table__).values(
+        key=key, fingerprint=fingerprint, status_code=status_code, response_body=body,
+        expires_at=datetime.now(timezone.utc) + IDEMPOTENCY_TTL,
+    )
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=['key'],
+        set_={
+            'fingerprint': stmt.excluded.fingerprint,
+            'status_code': stmt.excluded.status_code,
+            'response_body': stmt.excluded.response_body,
+            'expires_at': stmt.excluded.expires_at,
+            'updated_at': func.now(),
+        },
+    ))
+    connection.commit()
+
+
+async def idempotency_middleware(request: Request, call_next):
+    """
+    HTTP middleware replaying the stored response of data-entry writes retried
+    with the same Idempotency-Key, without running the endpoint again.
+    Concurrent duplicates block on a Postgres advisory lock until the first
+    attempt has stored its response.
+    """
+    client_key = request.headers.get("Idempotency-Key")
+    if not client_key or request.method != "POST" or not request.url.path.endswith(IDEMPOTENT_PATH_SUFFIXES):
+        return await call_next(request)
+    if len(client_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        return JSONResponse(status_code=400, content={"detail": f"Idempotency-Key must be at most {MAX_IDEMPOTENCY_KEY_LENGTH} characters"})
+
+    # Keys are scoped per route, and per user when authenticated. Not by client
+    # address, which can change between a request and its retry.
+    scope = authenticated_subject(request) or "anonymous"
+    key = f"{scope} {request.method} {request.url.path} {client_key}"
+    fingerprint = hashlib.sha256(await request.body()).hexdigest()
+
+    cached = _lru_get(key)
+    if cached is not None:
+        return _replay(fingerprint, *cached[1:])
+
+    try:
+        outcome, value = await run_in_threadpool(_acquire, key)
+    except OperationalError as e:
+        if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+            raise
+        # The first attempt is still running
+        return JSONResponse(
+            status_code=409,
+            content={"detail": "A request with this Idempotency-Key is still in progress"},
+            headers={"Retry-After": "1"},
+        )
+    except PoolTimeoutError:
+        return JSONResponse(status_code=503, content={"detail": "Server busy, try again later"}, headers={"Retry-After": "1"})
+    if outcome == "replay":
+        stored_fingerprint, status_code, body, expires_at = value
+        _lru_put(key, stored_fingerprint, status_code, body, (expires_at - datetime.now(timezone.utc)).total_seconds())
+        return _replay(fingerprint, stored_fingerprint, status_code, body)
+
+    connection = value
+    try:
+        response = await call_next(request)
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        # Transient errors are not stored, so a retry runs the request again
+        if 200 <= response.status_code < 300 or response.status_code in STORED_CLIENT_ERRORS:
+            try:
+                await run_in_threadpool(_store, connection, key, fingerprint, response.status_code, body)
+                _lru_put(key, fingerprint, response.status_code, body, IDEMPOTENCY_TTL.total_seconds())
+            except Exception as e:
+                # The write itself succeeded; failing the response would make the client retry it
+                logger.error(f"IDEMPOTENCY KEY NOT STORED FOR {request.method} {request.url.path}: {e}")
+    finally:
+        await run_in_threadpool(_release, connection, key)
+
+    return Response(content=body, status_code=response.status_code, headers=dict(response.headers), media_type=response.media_type)
+
+
+def purge_idempotency_keys(db):
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < func.now()))
+    db.commit()
+    logger.info(f"PURGED {result.rowcount} EXPIRED IDEMPOTENCY KEYS")
+
+
+def start_idempotency_purge_thread():
+    """
+    Periodically delete expired keys from the table in the background.
+    """
+    return start_periodic_job("idempotency-purge", IDEMPOTENCY_PURGE_SECONDS, IDEMPOTENCY_PURGE_LOCK_KEY, purge_idempotency_keys)
@@ -0,0 +1,35 @@
+from sqlalchemy import text
+from src.database import engine, SessionLocal
+import logging
+import threading
+
+# Create a logger
+logger = logging.getLogger(__name__)
+
+
+def start_periodic_job(name: str, interval_seconds: int, lock_key: int, job):
+    """
+    Run job(db) every interval_seconds in a daemon thread. Every worker runs the
+    loop, but a Postgres advisory lock lets only one of them do the work at a time.
+    Returns an Event that stops the loop when set.
+    """
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval_seconds):
+            db = SessionLocal()
+            try:
+                # The lock is held on its own connection, the job's session may commit freely
+                with engine.connect() as lock_connection:
+                    if lock_connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": lock_key}).scalar():
+                        try:
+                            job(db)
+                        finally:
+                            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": lock_key})
+            except Exception as e:
+                logger.error(f"JOB {name} FAILED: {e}")
+            finally:
+                db.close()
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return stop
@@ -0,0 +1,39 @@
+from fastapi.responses import ORJSONResponse
+from decimal import Decimal
+import orjson
+
+
+def _json_default(value):
+    # Only called for types orjson cannot encode natively
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    orjson response that also encodes Numeric columns, as exact decimal strings.
+    Every endpoint returning form records uses it, so a Numeric field has the
+    same representation everywhere.
+    """
+    def render(self, content):
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def rows_to_dicts(result):
+    """
+    Convert a SQLAlchemy result of plain column tuples into a list of dictionaries.
+    """
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def fast_json_response(result):
+    """
+    Encode a column-tuple query result straight to JSON with orjson.
+
+    The rows come from explicit column selects on our own tables, so they skip
+    ORM identity-map bookkeeping and response_model validation. orjson handles
+    datetimes, dates, enums, JSONB and arrays natively.
+    """
+    return FastJSONResponse(rows_to_dicts(result))
@@ -0,0 +1,50 @@
+import pytest
+from src.utils import admission
+from src.utils.admission import classify_request, take_token
+
+
+@pytest.mark.parametrize("method, path, expected", [
+    ("POST", "/api/data/readings/insert", "insert"),
+    ("PUT", "/api/data/readings/5", "insert"),
+    ("POST", "/api/users/bulk", "insert"),
+    ("POST", "/api/data/readings/5/approve", "approve"),
+    ("GET", "/api/data/readings", "read"),
+    ("POST", "/api/data/readings/batch", "read"),
+    ("POST", "/api/data/readings/aggregate", "read"),
+    ("POST", "/api/token", "read"),
+    ("DELETE", "/api/forms/3", "admin"),
+])
+def test_classify_request(method, path, expected):
+    assert classify_request(method, path) == expected
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(admission, "_buckets", type(admission._buckets)())
+    return now
+
+
+def test_take_token_burst_then_refill(clock):
+    limit = admission.RATE_LIMITS["token"]
+    for _ in range(limit["burst"]):
+        assert take_token("token", "10.0.0.1") == 0
+    wait = take_token("token", "10.0.0.1")
+    assert wait == pytest.approx(1 / limit["rate"])
+    clock[0] += wait
+    assert take_token("token", "10.0.0.1") == 0
+    # Other callers have their own bucket
+    assert take_token("token", "10.0.0.2") == 0
+
+
+def test_take_token_evicts_least_recently_used(clock, monkeypatch):
+    monkeypatch.setattr(admission, "MAX_BUCKETS", 2)
+    for _ in range(admission.RATE_LIMITS["token"]["burst"]):
+        take_token("token", "a")
+    take_token("token", "b")
+    take_token("token", "a")
+    take_token("token", "c")
+    # "b" was least recently used, "a" keeps its (empty) bucket
+    assert list(admission._buckets) == [("token", "a"), ("token", "c")]
+    assert take_token("token", "a") > 0
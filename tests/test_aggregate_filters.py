@@ -0,0 +1,45 @@
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from fastapi import HTTPException
+from src.routes.aggregate_routes import coerce_filter_value, SYSTEM_FIELD_TYPES
+
+
+@pytest.mark.parametrize("field_type, value, expected", [
+    ("Integer", 5, 5),
+    ("BigInteger", "7", 7),
+    ("Float", 2.5, 2.5),
+    ("Numeric(10,2)", "1.50", Decimal("1.50")),
+    ("Boolean", True, True),
+    ("String(10)", "abc", "abc"),
+    ("Enum(LOW,HIGH)", "LOW", "LOW"),
+    ("DateTime", "2026-01-02T03:04:05", datetime(2026, 1, 2, 3, 4, 5)),
+    ("Date", "2026-01-02", date(2026, 1, 2)),
+])
+def test_coerce_valid_values(field_type, value, expected):
+    assert coerce_filter_value("field", field_type, value) == expected
+
+
+@pytest.mark.parametrize("field_type, value", [
+    ("Integer", True),
+    ("Integer", 2.5),
+    ("Float", "abc"),
+    ("Float", "inf"),
+    ("Numeric", "nan"),
+    ("Boolean", 1),
+    ("String", 3),
+    ("Enum(LOW,HIGH)", "MEDIUM"),
+    ("Date", "not a date"),
+    ("JSONB", {"a": 1}),
+    ("Array(Integer)", [1]),
+])
+def test_coerce_invalid_values(field_type, value):
+    with pytest.raises(HTTPException) as error:
+        coerce_filter_value("field", field_type, value)
+    assert error.value.status_code == 400
+
+
+def test_approved_status_is_an_enum_filter():
+    assert coerce_filter_value("approved_status", SYSTEM_FIELD_TYPES["approved_status"], "APPROVED") == "APPROVED"
+    with pytest.raises(HTTPException):
+        coerce_filter_value("approved_status", SYSTEM_FIELD_TYPES["approved_status"], "DONE")
@@ -0,0 +1,44 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Numeric, String, Enum as SqlEnum
+from sqlalchemy.dialects.postgresql import ARRAY
+from src.routes.form_routes import resolve_column_type, validate_field_types, search_vector_expression
+
+
+@pytest.mark.parametrize("field_type", ["Integer", "String(64)", "Numeric(10,2)", "Numeric(5)", "Enum(LOW,HIGH)", "Array(Integer)", "JSONB"])
+def test_resolve_supported_types(field_type):
+    assert resolve_column_type(field_type, "form_field_enum") is not None
+
+
+@pytest.mark.parametrize("field_type", [
+    "String(abc)", "String(0)", "Array(Numeric)", "Array", "Enum", "Enum(A,A)", "Enum(A,,B)",
+    "Numeric(5,7)", "Numeric(0)", "Strng", "", None, 5,
+])
+def test_resolve_unsupported_types(field_type):
+    assert resolve_column_type(field_type, "form_field_enum") is None
+
+
+def test_resolve_parameterised_types():
+    assert isinstance(resolve_column_type("String(64)", "e"), String)
+    assert resolve_column_type("String(64)", "e").length == 64
+    numeric = resolve_column_type("Numeric(10,2)", "e")
+    assert isinstance(numeric, Numeric) and (numeric.precision, numeric.scale) == (10, 2)
+    enum = resolve_column_type("Enum( LOW , HIGH )", "form_level_enum")
+    assert isinstance(enum, SqlEnum) and enum.enums == ["LOW", "HIGH"] and enum.name == "form_level_enum"
+    assert isinstance(resolve_column_type("Array(Integer)", "e"), ARRAY)
+
+
+def test_validate_field_types_rejects_unsupported_and_reserved():
+    validate_field_types("form", {"name": "String", "level": "Enum(LOW,HIGH)"})
+    with pytest.raises(HTTPException) as error:
+        validate_field_types("form", {"name": "String(abc)"})
+    assert error.value.status_code == 400
+    with pytest.raises(HTTPException) as error:
+        validate_field_types("form", {"approved_status": "String"})
+    assert error.value.status_code == 400
+
+
+def test_search_vector_expression_quotes_field_names():
+    expression = search_vector_expression(['title', 'x", \'\')) STORED); DROP TABLE users; --'])
+    assert expression.startswith("to_tsvector('english', coalesce(title, '')")
+    assert '"x"", \'\')) STORED); DROP TABLE users; --"' in expression
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException
+from src.routes.rollup_routes import choose_resolution, get_rollup, to_local_naive
+
+
+@pytest.mark.parametrize("span, max_points, expected", [
+    (timedelta(hours=1), 500, "minute"),
+    (timedelta(hours=9), 500, "hour"),
+    (timedelta(days=7), 500, "hour"),
+    (timedelta(days=30), 500, "day"),
+    (timedelta(days=3650), 500, "day"),
+    (timedelta(minutes=10), 10, "minute"),
+    (timedelta(minutes=11), 10, "hour"),
+])
+def test_choose_resolution(span, max_points, expected):
+    assert choose_resolution(span, max_points) == expected
+
+
+def test_to_local_naive():
+    naive = datetime(2026, 1, 1, 12)
+    assert to_local_naive(naive) is naive
+    aware = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    assert to_local_naive(aware).tzinfo is None
+    assert to_local_naive(aware) == aware.astimezone().replace(tzinfo=None)
+
+
+def test_get_rollup_rejects_non_positive_max_points(monkeypatch):
+    class FakeForm:
+        id = 1
+        rollup_fields = ["temperature"]
+
+    monkeypatch.setattr("src.routes.rollup_routes.get_cached_form", lambda name, db: FakeForm())
+    with pytest.raises(HTTPException) as error:
+        get_rollup("readings", "temperature", max_points=0, db=None)
+    assert error.value.status_code == 400
@@ -0,0 +1,47 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import MetaData, Table, Column, Integer, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from src.routes import data_entry_routes
+from src.routes.data_entry_routes import search_data, search_dynamic_table
+
+
+class FakeForm:
+    searchable_fields = ["title"]
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt, bind_arguments=None):
+        self.statements.append(stmt)
+        return self
+
+    def fetchall(self):
+        return []
+
+
+@pytest.fixture
+def searchable_form(monkeypatch):
+    table = Table("readings", MetaData(), Column("id", Integer, primary_key=True), Column("title", String), Column("search_vector", TSVECTOR))
+    monkeypatch.setattr(data_entry_routes, "get_cached_form", lambda name, db: FakeForm())
+    monkeypatch.setattr(data_entry_routes, "get_dynamic_table", lambda name, db: table)
+    monkeypatch.setattr(data_entry_routes, "get_form_bind", lambda name, db: None)
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_search_rejects_non_positive_limit(limit):
+    with pytest.raises(HTTPException) as error:
+        search_data("readings", "pump", limit=limit, db=None)
+    assert error.value.status_code == 400
+
+
+def test_search_cursor_compares_rank_as_real(searchable_form):
+    db = FakeSession()
+    result = search_dynamic_table("readings", "pump", 20, 0.0607927, 42, db)
+    assert result == {"results": [], "next_cursor": None}
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "CAST(%(param_1)s AS REAL)" in sql
+    assert "ts_rank(readings.search_vector" in sql